@@ -1,57 +1,77 @@
-import streamlit as st
-import pandas as pd
-from visuals.plots import plot_price_vs_sentiment, plot_return_boxplot, plot_corr_heatmap
-from visuals.insights import generate_sentiment_summary, generate_observations
-from models.model import run_logistic_model
-from visuals.plots import plot_price_with_moving_averages
-from visuals.plots import plot_return_histogram
-from visuals.plots import (
-    plot_price_vs_sentiment,
-    plot_return_boxplot,
-    plot_corr_heatmap,
-    plot_feature_importance,
-    plot_volatility_trendline
-)
-from models.model import run_logistic_model
-from models.prediction import load_or_create_prediction
 import os
-import pandas as pd
-from datetime import datetime
-import yfinance as yf
-
-
-
-
-
-
-
-# Load data
-@st.cache_data
-def load_data():
-    return pd.read_csv("data/featured_data.csv", parse_dates=["date"])
-
-df = load_data()
-
-# 🛠️ Ensure required columns exist
-if 'target' not in df.columns:
-    df['target'] = (df['close'].shift(-1) > df['close']).astype(int)
-# Add derived columns if missing
-if 'daily_return' not in df.columns:
-    df['daily_return'] = df['close'].pct_change()
-
-if 'volatility' not in df.columns:
-    df['volatility'] = df['daily_return'].rolling(window=7).std()
-
-if 'sentiment_encoded' not in df.columns:
-    # Simple encoding: Fear = 0, Neutral = 1, Greed = 2 (modify if you use other states)
-    sentiment_map = {'Fear': 0, 'Neutral': 1, 'Greed': 2}
-    df['sentiment_encoded'] = df['fgi_sentiment'].map(sentiment_map)
 
-if 'target' not in df.columns:
-    df['target'] = (df['close'].shift(-1) > df['close']).astype(int)
+import streamlit as st
+import pandas as pd
 
-# Remove NaNs introduced by pct_change and rolling
-df.dropna(inplace=True)
+import instrumentation
+from instrumentation import span
+from data.export import EXPORT_FORMATS, export_bytes
+from data.intraday import available_resolutions
+from data.load_data import build_model_frame, load_data as load_featured_data, slice_dates
+from data.store import featured_table, table_path
+from models.prediction_store import open_store
+from visuals.downsample import DEFAULT_WIDTH_PX, target_points
+
+# Heavier modules (sklearn, plotly, matplotlib/seaborn, yfinance) are imported
+# by the view that needs them, so startup only pays for the one on screen
+
+
+# Spans recorded during this rerun, shown in the debug panel when BTC_INSTRUMENT is set
+run_spans = instrumentation.start_run()
+
+
+def data_version(resolution="1d"):
+    # Changes whenever the feature table is rewritten, invalidating everything cached from it
+    path = table_path(featured_table(resolution))
+    return os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+
+# Load data once per process and data version; the derived frame is shared read-only across reruns
+@st.cache_resource(max_entries=4)
+def load_data(resolution="1d", version=0):
+    return build_model_frame(load_featured_data(resolution=resolution))
+
+@st.cache_resource(max_entries=4)
+def load_correlations(resolution="1d", version=0):
+    from visuals.correlation import PrefixCorrelation
+
+    # Moving averages just track the close price, so they stay out of the heatmap
+    df = load_data(resolution, version)
+    columns = df.select_dtypes(include='number').columns.difference(["ma_7", "ma_30"], sort=False)
+    return PrefixCorrelation(df, columns=list(columns))
+
+@st.cache_resource(max_entries=4)
+def load_sentiment_index(resolution="1d", version=0):
+    from visuals.insights import SentimentIndex
+    return SentimentIndex(load_data(resolution, version))
+
+@st.cache_resource
+def get_prediction_store():
+    return open_store()
+
+# Figures keyed by (plot function, resolution, date range, data version, options);
+# switching views or going back to an earlier range reuses the built figure
+@st.cache_resource(max_entries=64)
+def build_figure(plot_name, resolution, start, end, version, **options):
+    from visuals import plots
+    df = slice_dates(load_data(resolution, version), start, end)
+    return getattr(plots, plot_name)(df, **options)
+
+# Export bytes per (resolution, date range, format); built on the first click only
+@st.cache_data(max_entries=16)
+def export_range(resolution, start, end, fmt, version=0):
+    df = slice_dates(load_data(resolution, version), start, end)
+    with span(f"export_{fmt}", rows=len(df)):
+        return export_bytes(df, fmt)
+
+# Seconds between live price refreshes, shared by every session
+LIVE_PRICE_INTERVAL = int(os.environ.get("LIVE_PRICE_INTERVAL", 60))
+# Seconds a cold start waits for the first price before showing a loading note
+LIVE_PRICE_WAIT = 2
+
+@st.cache_resource
+def get_price_poller():
+    from data.live_price import LivePricePoller
+    return LivePricePoller(interval=LIVE_PRICE_INTERVAL).start()
 
 
 # Page config
@@ -61,34 +81,42 @@ st.markdown("Built by Tanvi Sundarkar • Inspired by [Gaies et al., 2023]")
 
 # Sidebar Filters
 st.sidebar.header("🔎 Filter Data")
-start_date = st.sidebar.date_input("Start Date", df['date'].min().date())
-end_date = st.sidebar.date_input("End Date", df['date'].max().date())
-csv_path = "model.predictions.csv"
-if os.path.exists(csv_path):
-    pred_df = pd.read_csv(csv_path)
-    pred_df = pred_df[pred_df["is_correct"] != "N/A"]
+resolution = st.sidebar.selectbox("Resolution", available_resolutions())
+version = data_version(resolution)
+df = load_data(resolution, version)
+start_date = st.sidebar.date_input("Start Date", df.index[0].date())
+end_date = st.sidebar.date_input("End Date", df.index[-1].date())
+prediction_store = get_prediction_store()
+accuracy_over_time = prediction_store.accuracy()
+if accuracy_over_time is not None:
+    st.metric("📊 Historical Accuracy", f"{accuracy_over_time * 100:.2f}%")
+
+df_filtered = slice_dates(df, start_date, end_date)
+
+# Long ranges are thinned to about one point per pixel before going to the browser
+downsample_charts = st.sidebar.checkbox("Downsample long time series", value=True)
+max_points = target_points(len(df_filtered), DEFAULT_WIDTH_PX) if downsample_charts else None
 
-    if not pred_df.empty:
-        accuracy_over_time = pred_df["is_correct"].astype(int).mean()
-        st.metric("📊 Historical Accuracy", f"{accuracy_over_time * 100:.2f}%")
 
-df_filtered = df[(df['date'] >= pd.to_datetime(start_date)) & (df['date'] <= pd.to_datetime(end_date))]
+def figure(plot_name, **options):
+    return build_figure(plot_name, resolution, start_date, end_date, version, **options)
 
 
-# Tabs
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
+# Views: unlike st.tabs, only the selected one is built on each rerun
+VIEWS = [
     "📈 Price & Sentiment",
     "📊 Return vs Sentiment",
     "🧠 Correlations",
     "📌 Insights",
     "📈 Prediction"
-])
+]
+view = st.radio("View", VIEWS, horizontal=True, label_visibility="collapsed")
 
 
 
-with tab1:
+if view == VIEWS[0]:
     st.subheader("Bitcoin Closing Price vs Fear & Greed Index")
-    st.plotly_chart(plot_price_vs_sentiment(df_filtered), use_container_width=True)
+    st.plotly_chart(figure("plot_price_vs_sentiment", max_points=max_points), use_container_width=True)
     st.markdown("### 📘 What this chart shows")
     st.markdown("""
         - The **blue line** represents Bitcoin’s daily closing price.
@@ -98,11 +126,11 @@ with tab1:
         """)
 
     st.subheader("Bitcoin Price with Moving Averages")
-    st.plotly_chart(plot_price_with_moving_averages(df_filtered), use_container_width=True)
+    st.plotly_chart(figure("plot_price_with_moving_averages", max_points=max_points), use_container_width=True)
 
-with tab2:
+elif view == VIEWS[1]:
     st.subheader("Distribution of Daily Returns by Sentiment")
-    st.plotly_chart(plot_return_boxplot(df_filtered), use_container_width=True)
+    st.plotly_chart(figure("plot_return_boxplot"), use_container_width=True)
     st.markdown("### 📘 What this chart shows")
     st.markdown("""
         - This boxplot shows how **daily returns** vary based on sentiment categories like *Fear*, *Neutral*, and *Greed*.
@@ -111,11 +139,14 @@ with tab2:
         """)
 
     st.subheader("Histogram of Daily Returns")
-    st.plotly_chart(plot_return_histogram(df_filtered), use_container_width=True, key="return_hist")
+    st.plotly_chart(figure("plot_return_histogram"), use_container_width=True, key="return_hist")
 
-with tab3:
+elif view == VIEWS[2]:
     st.subheader("Feature Correlation Heatmap")
-    st.pyplot(plot_corr_heatmap(df_filtered))
+    correlations = load_correlations(resolution, version)
+    with span("correlations.matrix"):
+        corr = correlations.matrix(start_date, end_date)
+    st.pyplot(figure("plot_corr_heatmap", corr=corr))
     st.markdown("### 📘 What this chart shows")
     st.markdown("""
         - This heatmap shows **pairwise correlations** between numerical features such as:
@@ -129,12 +160,22 @@ with tab3:
             - `daily_return` and `volatility` (may be low or negative)
         - These help in **feature selection** and **understanding market behavior**.
         """)
-with tab4:
+
+    # FGI lags are by calendar day at every resolution; returns are per bar
+    return_label = "Today's Return" if resolution == "1d" else f"Each {resolution} Bar's Return"
+    st.subheader(f"Rolling Correlation: Yesterday's FGI vs {return_label}")
+    window = st.slider("Window (bars)", min_value=7, max_value=180, value=30)
+    st.line_chart(correlations.rolling("fgi_value_lag1", "daily_return", window, start_date, end_date))
+elif view == VIEWS[3]:
     st.subheader("🧠 Behavioral Insights from Sentiment States")
 
+    from visuals.insights import generate_observations, generate_sentiment_summary
+
+    sentiment_index = load_sentiment_index(resolution, version)
+
     # Summary table
     st.markdown("### 📊 Summary Table")
-    st.dataframe(generate_sentiment_summary(df_filtered), use_container_width=True)
+    st.dataframe(generate_sentiment_summary(df_filtered, index=sentiment_index), use_container_width=True)
 
     st.markdown("### 📘 What this table shows")
     st.markdown("""
@@ -151,7 +192,7 @@ with tab4:
 
     # Key observations
     st.markdown("### 📝 Key Observations")
-    for insight in generate_observations(df_filtered):
+    for insight in generate_observations(df_filtered, index=sentiment_index):
         st.success(insight)
 
     st.markdown("### 📘 How to interpret the observations")
@@ -161,15 +202,31 @@ with tab4:
     - Use them to build intuition for trading decisions or model features.
     """)
 
-with tab5:
+elif view == VIEWS[4]:
+    from datetime import datetime
+    from models.model import run_logistic_model
+    from models.online import load_or_create_online_prediction
+    from models.prediction import load_or_create_prediction
+    from visuals.plots import plot_feature_importance
+
     st.subheader("📈 Predicting Price Direction using Sentiment")
 
-    # Generate or load prediction
-    pred, accuracy, coefs = load_or_create_prediction(run_logistic_model, df)
+    # The prediction is a next-day call, so it always runs on daily bars
+    daily_df = load_data("1d", data_version("1d"))
+
+    # Generate or load prediction: a full refit, or the checkpointed online model
+    # that only learns the rows added since its last update
+    model_mode = st.radio("Model", ["Batch refit", "Online (SGD)"], horizontal=True)
+    if model_mode == "Batch refit":
+        pred, accuracy, coefs = load_or_create_prediction(run_logistic_model, daily_df, store=prediction_store)
+        accuracy_label = "Model Accuracy on Training Data"
+    else:
+        pred, accuracy, coefs = load_or_create_online_prediction(daily_df, store=prediction_store)
+        accuracy_label = "Online Accuracy (each day predicted before it was learned)"
 
     today = datetime.now().strftime("%Y-%m-%d")
     st.markdown(f"**Prediction for {today}:** BTC will **{'rise 📈' if pred == 1 else 'fall 📉'}** tomorrow.")
-    st.markdown(f"**Model Accuracy on Training Data:** {accuracy:.2%}")
+    st.markdown(f"**{accuracy_label}:** {accuracy:.2%}")
 
     # Feature importance table
     if coefs is not None:
@@ -182,44 +239,46 @@ with tab5:
     st.subheader("📊 Feature Influence")
     st.plotly_chart(plot_feature_importance(coefs), use_container_width=True)
 
-    # Live BTC price using yfinance
-    btc = yf.Ticker("BTC-USD")
-    try:
-        live_price = btc.history(period="1d")["Close"].iloc[-1]
-        st.metric("💰 Current BTC Price", f"${live_price:,.2f}")
-    except:
+    # Live BTC price from the shared background poller
+    with span("live_price"):
+        quote = get_price_poller().get(wait=LIVE_PRICE_WAIT)
+    if quote.loading:
+        st.info("⏳ Fetching live BTC price…")
+    elif quote.price is None:
         st.warning("⚠️ Unable to fetch live BTC price.")
+    else:
+        st.metric("💰 Current BTC Price", f"${quote.price:,.2f}")
+        st.caption(f"{'⚠️ Stale — ' if quote.stale else ''}updated {quote.age:.0f}s ago")
 
     # Volatility trend
     st.subheader("📉 Volatility Trend (7-Day Rolling)")
-    st.plotly_chart(plot_volatility_trendline(df_filtered), use_container_width=True)
+    st.plotly_chart(figure("plot_volatility_trendline", max_points=max_points), use_container_width=True)
 
     # Historical prediction tracker
     st.subheader("📅 Historical Prediction Accuracy Tracker")
-    csv_path = "data/predictions.csv"
-    if os.path.exists(csv_path):
-        hist_df = pd.read_csv(csv_path)
-        if "date" in hist_df.columns and "accuracy" in hist_df.columns and "predicted_direction" in hist_df.columns:
-            hist_df["date"] = pd.to_datetime(hist_df["date"])
-            hist_df = hist_df.set_index("date")
-
-            st.line_chart(hist_df["predicted_direction"])
-            st.caption("Shows the predicted direction over time.")
-
-            acc = hist_df["accuracy"].dropna().mean()
-            st.metric("📊 Average Historical Accuracy", f"{acc:.2%}")
-        else:
-            st.warning("❌ Missing required columns in predictions.csv")
+    # Predictions are stamped with the day they were made, after the data's
+    # last date, so the upper bound reaches at least today
+    with span("prediction_store.range"):
+        hist_df = prediction_store.range(start_date, max(end_date, datetime.now().date()))
+    if not hist_df.empty:
+        # One line per model version
+        st.line_chart(hist_df.pivot(index="date", columns="model_version", values="predicted_direction"))
+        st.caption("Shows the predicted direction over time.")
+
+        acc = hist_df["accuracy"].dropna().mean()
+        st.metric("📊 Average Historical Accuracy", f"{acc:.2%}")
     else:
-        st.warning("📁 predictions.csv not found. Predictions will be stored here after first run.")
+        st.warning("📁 No predictions stored for this date range yet. They are recorded as the dashboard runs.")
 
     # Dataset download
     st.subheader("💾 Download Filtered Dataset")
+    export_format = st.radio("Format", list(EXPORT_FORMATS), horizontal=True, format_func=str.upper)
+    # Serialized only when the button is clicked, then cached for this range
     st.download_button(
-        label="Download CSV",
-        data=df_filtered.to_csv(index=False).encode(),
-        file_name="filtered_bitcoin_sentiment.csv",
-        mime="text/csv"
+        label=f"Download {export_format.upper()}",
+        data=lambda: export_range(resolution, start_date, end_date, export_format, version),
+        file_name=f"filtered_bitcoin_sentiment.{EXPORT_FORMATS[export_format]['extension']}",
+        mime=EXPORT_FORMATS[export_format]["mime"]
     )
 
     # Interpretations
@@ -231,6 +290,17 @@ with tab5:
         - **Prediction**: Estimate next-day price direction from sentiment.
         """)
 
+# Timings for this rerun
+if instrumentation.ENABLED:
+    with st.expander("🐞 Debug: timings"):
+        if run_spans:
+            timings = pd.DataFrame(run_spans)
+            timings["peak_mb"] = timings["peak_bytes"] / 2**20
+            st.dataframe(timings[["name", "seconds", "rows", "peak_mb", "depth"]], use_container_width=True)
+            st.caption(f"Total {timings.loc[timings['depth'] == 0, 'seconds'].sum():.3f}s in top-level spans")
+        else:
+            st.caption("Nothing recorded on this rerun.")
+
 # Footer
 st.markdown("---")
 st.caption("Data sources: [Alternative.me](https://alternative.me), [Yahoo Finance](https://finance.yahoo.com/)")
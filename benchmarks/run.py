@@ -0,0 +1,208 @@
+# benchmarks/run.py
+
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+import models.prediction as prediction
+from benchmarks.synthetic import make_btc, make_fgi, parse_size
+from data.load_data import build_model_frame
+from data.store import write_table
+from models.model import run_logistic_model
+from models.prediction_store import PredictionStore
+from scripts.feature_engineering import create_features
+from scripts.merge_data import merge_fgi_and_btc
+from visuals import plots
+from visuals.insights import SentimentIndex, generate_observations, generate_sentiment_summary
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Plotly/matplotlib figures at millions of points mostly measure the renderer
+MAX_PLOT_ROWS = 1_000_000
+
+# Below these, run-to-run noise is larger than any real change
+MIN_SECONDS = 0.001
+MIN_PEAK_MB = 1.0
+
+# Timed runs per case. The median of several runs is what gets compared; a
+# single run swings by 30-40% between identical back-to-back invocations
+DEFAULT_REPEAT = 7
+MIN_COMPARE_REPEAT = 5
+
+
+def _peak_mb(func):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    plt.close("all")
+    return peak / 2**20
+
+
+def measure(cases, repeat=DEFAULT_REPEAT):
+    # One untimed warm-up per case (imports, first-call caches), then `repeat`
+    # round-robin rounds: a slow stretch on a shared machine lands on every
+    # case instead of a few. Median and best wall time per case, then one
+    # extra run under tracemalloc for the peak
+    for func in cases.values():
+        func()
+    plt.close("all")
+
+    times = {name: [] for name in cases}
+    for _ in range(repeat):
+        for name, func in cases.items():
+            gc.collect()
+            start = time.perf_counter()
+            func()
+            times[name].append(time.perf_counter() - start)
+        plt.close("all")
+
+    return {
+        name: {"seconds": float(np.median(times[name])), "best_seconds": min(times[name]), "peak_mb": _peak_mb(func)}
+        for name, func in cases.items()
+    }
+
+
+def _prediction_case(frame, workdir):
+    # Cold path: no memoized model, no artifact, empty store
+    def run():
+        prediction._loaded.clear()
+        shutil.rmtree(os.path.join(workdir, "artifacts"), ignore_errors=True)
+        db_path = os.path.join(workdir, "predictions.db")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+        store = PredictionStore(db_path)
+        prediction.load_or_create_prediction(run_logistic_model, frame, store, os.path.join(workdir, "artifacts"))
+    return run
+
+
+def build_cases(n_rows, root, max_plot_rows=MAX_PLOT_ROWS):
+    # Seeded inputs, written where the pipeline stages read them
+    write_table(make_btc(n_rows), "btc_data", root)
+    write_table(make_fgi(n_rows), "fgi_data", root)
+    write_table(merge_fgi_and_btc(root), "merged_data", root)
+
+    featured = create_features(root)
+    frame = build_model_frame(featured)
+    _, _, _, coefs = run_logistic_model(frame)
+
+    cases = {
+        "merge_fgi_and_btc": lambda: merge_fgi_and_btc(root),
+        "create_features": lambda: create_features(root),
+        "run_logistic_model": lambda: run_logistic_model(frame),
+        "load_or_create_prediction": _prediction_case(frame, root),
+        "insights.sentiment_index": lambda: SentimentIndex(frame),
+        "insights.generate_sentiment_summary": lambda: generate_sentiment_summary(frame),
+        "insights.generate_observations": lambda: generate_observations(frame),
+    }
+
+    if len(frame) <= max_plot_rows:
+        cases.update({
+            "plots.plot_price_vs_sentiment": lambda: plots.plot_price_vs_sentiment(frame),
+            "plots.plot_return_boxplot": lambda: plots.plot_return_boxplot(frame),
+            "plots.plot_corr_heatmap": lambda: plots.plot_corr_heatmap(frame),
+            "plots.plot_price_with_moving_averages": lambda: plots.plot_price_with_moving_averages(frame),
+            "plots.plot_return_histogram": lambda: plots.plot_return_histogram(frame),
+            "plots.plot_feature_importance": lambda: plots.plot_feature_importance(coefs),
+            "plots.plot_volatility_trendline": lambda: plots.plot_volatility_trendline(frame),
+        })
+    return cases
+
+
+def run_benchmarks(sizes, repeat=DEFAULT_REPEAT, max_plot_rows=MAX_PLOT_ROWS):
+    results = {}
+    for label in sizes:
+        n_rows = parse_size(label)
+        root = tempfile.mkdtemp(prefix=f"btc-bench-{label}-")
+        try:
+            for name, result in measure(build_cases(n_rows, root, max_plot_rows), repeat).items():
+                results[f"{name}@{label}"] = {"rows": n_rows, **result}
+                print(f"{name}@{label}: {result['seconds'] * 1000:.1f} ms, peak {result['peak_mb']:.1f} MB")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=0.25):
+    # A case regresses when its median time or peak memory grows by more than
+    # `threshold`. A slowdown must also show in the best run: noise inflates
+    # the median of a few runs far more often than the fastest one
+    regressions = []
+    for key, new in current["results"].items():
+        old = baseline["results"].get(key)
+        if old is None:
+            continue
+        for metric, floor in (("seconds", MIN_SECONDS), ("peak_mb", MIN_PEAK_MB)):
+            if old[metric] < floor and new[metric] < floor:
+                continue
+            ratio = new[metric] / max(old[metric], floor)
+            if ratio <= 1 + threshold:
+                continue
+            if metric == "seconds" and "best_seconds" in old and "best_seconds" in new:
+                if new["best_seconds"] / max(old["best_seconds"], floor) <= 1 + threshold:
+                    continue
+            regressions.append((key, metric, old[metric], new[metric], ratio))
+    return regressions
+
+
+# Run if executed directly
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every pipeline stage on synthetic data")
+    parser.add_argument("--sizes", nargs="+", default=["1k", "100k"],
+                        help="Row counts: 1k, 100k, 10m or a plain integer")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per case; the median is reported")
+    parser.add_argument("--max-plot-rows", type=int, default=MAX_PLOT_ROWS,
+                        help="Skip the figure builders above this many rows")
+    parser.add_argument("--out", default=os.path.join(RESULTS_DIR, "latest.json"))
+    parser.add_argument("--compare", metavar="BASELINE", help="Results JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed relative slowdown or memory growth before failing")
+    args = parser.parse_args()
+    if args.compare and args.repeat < MIN_COMPARE_REPEAT:
+        print(f"⚠️ --repeat {args.repeat} is too noisy to compare; using {MIN_COMPARE_REPEAT}")
+        args.repeat = MIN_COMPARE_REPEAT
+
+    current = run_benchmarks(args.sizes, args.repeat, args.max_plot_rows)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(current, f, indent=2)
+    print(f"✅ Results saved to {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        for key, metric, old, new, ratio in regressions:
+            print(f"❌ {key} {metric}: {old:.4g} -> {new:.4g} ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"✅ No regressions beyond {args.threshold:.0%} against {args.compare}")
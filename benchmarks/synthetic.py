@@ -0,0 +1,75 @@
+# benchmarks/synthetic.py
+
+import numpy as np
+import pandas as pd
+
+# Minute spacing keeps even 10M rows inside pandas' timestamp range; both
+# series share the grid so the exact-date merge keeps every row
+START = "2018-01-01"
+FREQ = "min"
+
+# alternative.me classification bands
+SENTIMENT_BANDS = [(24, "Extreme Fear"), (46, "Fear"), (54, "Neutral"), (75, "Greed"), (100, "Extreme Greed")]
+
+SIZES = {"1k": 1_000, "100k": 100_000, "10m": 10_000_000}
+
+# Daily volatility of the price walk, spread over the minute steps so the
+# closes stay near real BTC levels (and inside float32) for 10M rows
+DAILY_SIGMA = 0.03
+STEP_SIGMA = DAILY_SIGMA / np.sqrt(1440)
+
+
+def parse_size(label):
+    return SIZES.get(label.lower()) or int(label)
+
+
+def make_dates(n_rows):
+    return pd.date_range(START, periods=n_rows, freq=FREQ)
+
+
+def _ar1(noise, phi, block=256):
+    # x[t] = phi * x[t-1] + noise[t], a block at a time: within a block
+    # x[j] = phi^j * (phi * x[-1] + cumsum(noise[k] / phi^k)), and block
+    # keeps phi^-k small enough to stay exact in float64
+    out = np.empty_like(noise)
+    powers = phi ** np.arange(block)
+    last = 0.0
+    for start in range(0, len(noise), block):
+        chunk = noise[start:start + block]
+        p = powers[:len(chunk)]
+        out[start:start + len(chunk)] = p * (phi * last + np.cumsum(chunk / p))
+        last = out[start + len(chunk) - 1]
+    return out
+
+
+def make_btc(n_rows, seed=42):
+    # Geometric random walk with candles around it
+    rng = np.random.default_rng(seed)
+    close = 20_000 * np.exp(np.cumsum(rng.normal(0, STEP_SIGMA, n_rows)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    wick = np.abs(rng.normal(0, 0.01, (2, n_rows)))
+
+    return pd.DataFrame({
+        "date": make_dates(n_rows),
+        "open": open_,
+        "high": np.maximum(open_, close) * (1 + wick[0]),
+        "low": np.minimum(open_, close) * (1 - wick[1]),
+        "close": close,
+        "volume": rng.lognormal(23, 0.5, n_rows).astype(np.int64),
+    })
+
+
+def make_fgi(n_rows, seed=42):
+    # Mean-reverting AR(1) index around 50, clipped to 0-100 and classified like the real API
+    rng = np.random.default_rng(seed + 1)
+    value = 50 + _ar1(rng.normal(0, 4, n_rows), 0.95)
+    value = np.clip(np.round(value), 0, 100).astype(np.int64)
+
+    bounds = np.array([upper for upper, _ in SENTIMENT_BANDS])
+    labels = np.array([label for _, label in SENTIMENT_BANDS], dtype=object)
+
+    return pd.DataFrame({
+        "date": make_dates(n_rows),
+        "fgi_value": value,
+        "fgi_sentiment": labels[np.searchsorted(bounds, value)],
+    })
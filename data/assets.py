@@ -0,0 +1,100 @@
+# data/assets.py
+
+import glob
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data.store import CATEGORY_COLUMNS, DATA_DIR, ROW_GROUP_SIZE
+
+ASSETS_DIR = "assets"
+
+# Tracked by default next to BTC against the same sentiment index
+DEFAULT_TICKERS = ["BTC-USD", "ETH-USD", "SOL-USD", "BNB-USD", "XRP-USD", "ADA-USD", "DOGE-USD", "AVAX-USD"]
+
+
+# Long format (one `ticker` column), one hive partition per asset:
+# assets/<table>/ticker=<TICKER>/part.parquet. An asset is rewritten on its own,
+# and readers select assets by partition without opening the others.
+def table_dir(table, root=DATA_DIR):
+    return os.path.join(root, ASSETS_DIR, table)
+
+
+def asset_path(table, ticker, root=DATA_DIR):
+    return os.path.join(table_dir(table, root), f"ticker={ticker}", "part.parquet")
+
+
+def stored_tickers(table, root=DATA_DIR):
+    paths = glob.glob(os.path.join(table_dir(table, root), "ticker=*", "part.parquet"))
+    return sorted(os.path.basename(os.path.dirname(path))[len("ticker="):] for path in paths)
+
+
+def write_asset(df, table, ticker, root=DATA_DIR):
+    # The ticker lives in the partition path, not in the file
+    df = df.drop(columns="ticker", errors="ignore").copy()
+    df["date"] = pd.to_datetime(df["date"]).astype("datetime64[ns]")
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    df = df.sort_values("date").reset_index(drop=True)
+
+    path = asset_path(table, ticker, root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Leading dot: dataset discovery skips the file while it is being written
+    tmp_path = os.path.join(os.path.dirname(path), ".part.parquet.tmp")
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path, row_group_size=ROW_GROUP_SIZE)
+    os.replace(tmp_path, path)
+
+
+def read_assets(table, tickers=None, columns=None, start=None, end=None, root=DATA_DIR):
+    # Long frame for the requested assets, sorted by ticker then date
+    filters = []
+    if tickers is not None:
+        filters.append(("ticker", "in", list(tickers)))
+    if start is not None:
+        filters.append(("date", ">=", pd.Timestamp(start)))
+    if end is not None:
+        filters.append(("date", "<=", pd.Timestamp(end)))
+
+    if columns is not None and "ticker" not in columns:
+        columns = ["ticker"] + list(columns)
+    dataset = pq.ParquetDataset(table_dir(table, root), partitioning="hive", filters=filters or None)
+    df = dataset.read(columns=columns).to_pandas()
+    df["ticker"] = df["ticker"].astype(str).astype("category")
+    return df.sort_values(["ticker", "date"], kind="stable").reset_index(drop=True)
+
+
+def asset_columns(table, ticker, root=DATA_DIR):
+    path = asset_path(table, ticker, root)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No {table} data stored for {ticker} in {root}")
+    return pq.read_schema(path).names
+
+
+def read_asset(table, ticker, columns=None, start=None, end=None, root=DATA_DIR):
+    path = asset_path(table, ticker, root)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No {table} data stored for {ticker} in {root}")
+
+    filters = []
+    if start is not None:
+        filters.append(("date", ">=", pd.Timestamp(start)))
+    if end is not None:
+        filters.append(("date", "<=", pd.Timestamp(end)))
+    return pq.read_table(path, columns=columns, filters=filters or None, memory_map=True).to_pandas()
+
+
+def attach_fgi_by_asset(prices, fgi, tolerance=pd.Timedelta(0)):
+    # A single sorted as-of join of the long frame against the shared FGI series,
+    # rather than a full merge per asset. Zero tolerance keeps the daily
+    # inner-join behaviour: a bar only gets the FGI published for its own date.
+    prices = prices.sort_values("date", kind="stable").copy()
+    fgi = fgi.sort_values("date").copy()
+    prices["date"] = prices["date"].astype("datetime64[ns]")
+    fgi["date"] = fgi["date"].astype("datetime64[ns]")
+
+    merged = pd.merge_asof(prices, fgi, on="date", direction="backward", tolerance=tolerance)
+    merged = merged.dropna(subset=["fgi_value"]).astype({"fgi_value": int})
+    return merged.sort_values(["ticker", "date"], kind="stable").reset_index(drop=True)
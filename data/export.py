@@ -0,0 +1,72 @@
+# data/export.py
+
+import argparse
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data.store import ROW_GROUP_SIZE
+
+# Rows serialized at a time, so a long range never sits in memory as one big string
+CHUNK_ROWS = 100_000
+
+EXPORT_FORMATS = {
+    "csv": {"extension": "csv", "mime": "text/csv"},
+    "parquet": {"extension": "parquet", "mime": "application/vnd.apache.parquet"},
+}
+
+
+def iter_chunks(df, chunk_rows=CHUNK_ROWS):
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def write_csv(df, out, chunk_rows=CHUNK_ROWS):
+    # Header once, then one encoded chunk at a time
+    for i, chunk in enumerate(iter_chunks(df, chunk_rows)):
+        out.write(chunk.to_csv(index=False, header=(i == 0)).encode())
+
+
+def write_parquet(df, out, chunk_rows=CHUNK_ROWS):
+    # One row group per chunk, appended as it is converted
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in iter_chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False),
+                               row_group_size=ROW_GROUP_SIZE)
+
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet}
+
+
+def export_bytes(df, fmt="csv", chunk_rows=CHUNK_ROWS):
+    if fmt not in WRITERS:
+        raise ValueError(f"Unsupported export format {fmt!r}; expected one of {list(WRITERS)}")
+    buffer = io.BytesIO()
+    WRITERS[fmt](df, buffer, chunk_rows)
+    return buffer.getvalue()
+
+
+def export_file(df, path, fmt="csv", chunk_rows=CHUNK_ROWS):
+    # Streams straight to disk: only one chunk is ever serialized in memory
+    with open(path, "wb") as out:
+        WRITERS[fmt](df, out, chunk_rows)
+
+
+# Run if executed directly
+if __name__ == "__main__":
+    from data.load_data import load_data
+
+    parser = argparse.ArgumentParser(description="Export a date range of the feature table")
+    parser.add_argument("out", help="output file")
+    parser.add_argument("--format", choices=list(WRITERS), default="csv")
+    parser.add_argument("--start")
+    parser.add_argument("--end")
+    parser.add_argument("--resolution", default="1d")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    df = load_data(columns=None, start=args.start, end=args.end, resolution=args.resolution)
+    export_file(df, args.out, args.format, args.chunk_rows)
+    print(f"✅ {len(df)} rows exported to {args.out}")
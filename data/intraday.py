@@ -0,0 +1,123 @@
+# data/intraday.py
+
+import glob
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data.store import DATA_DIR, ROW_GROUP_SIZE, featured_table, read_table, table_path
+
+INTRADAY_DIR = "intraday"
+OHLCV_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+# Rollups must divide a UTC day, so resampling one daily partition at a time
+# gives the same bars as resampling the whole history
+ROLLUPS = ["1h", "4h", "1d"]
+
+OHLCV_AGG = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+
+OHLCV_SCHEMA = pa.schema([
+    ("date", pa.timestamp("ns")),
+    ("open", pa.float64()),
+    ("high", pa.float64()),
+    ("low", pa.float64()),
+    ("close", pa.float64()),
+    ("volume", pa.float64()),
+])
+
+
+def raw_dir(interval, root=DATA_DIR):
+    return os.path.join(root, INTRADAY_DIR, "raw", interval)
+
+
+def rollup_path(rule, root=DATA_DIR):
+    return os.path.join(root, INTRADAY_DIR, f"{rule}.parquet")
+
+
+def _as_schema(df):
+    df = df[OHLCV_COLUMNS].copy()
+    df['date'] = df['date'].astype("datetime64[ns]")
+    return pa.Table.from_pandas(df.astype({col: float for col in OHLCV_COLUMNS[1:]}),
+                                schema=OHLCV_SCHEMA, preserve_index=False)
+
+
+def write_raw_bars(bars, interval, root=DATA_DIR):
+    # One file per UTC day; re-ingested bars replace stored ones with the same timestamp
+    os.makedirs(raw_dir(interval, root), exist_ok=True)
+    written = 0
+    for day, chunk in bars.groupby(bars['date'].dt.normalize()):
+        path = os.path.join(raw_dir(interval, root), f"{day:%Y-%m-%d}.parquet")
+        if os.path.exists(path):
+            chunk = pd.concat([pq.read_table(path).to_pandas(), chunk], ignore_index=True)
+        chunk = chunk.drop_duplicates(subset='date', keep='last').sort_values('date')
+
+        tmp_path = path + ".tmp"
+        pq.write_table(_as_schema(chunk), tmp_path)
+        os.replace(tmp_path, path)
+        written += 1
+    return written
+
+
+def iter_raw_chunks(interval, start=None, end=None, root=DATA_DIR):
+    # Day partitions in date order, read one at a time
+    for path in sorted(glob.glob(os.path.join(raw_dir(interval, root), "*.parquet"))):
+        day = pd.Timestamp(os.path.basename(path)[:-len(".parquet")])
+        if start is not None and day < pd.Timestamp(start).normalize():
+            continue
+        if end is not None and day > pd.Timestamp(end):
+            break
+        yield pq.read_table(path, memory_map=True).to_pandas()
+
+
+def build_rollup(rule, interval, root=DATA_DIR):
+    if rule not in ROLLUPS:
+        raise ValueError(f"Unsupported rollup {rule!r}; expected one of {ROLLUPS}")
+
+    path = rollup_path(rule, root)
+    tmp_path = path + ".tmp"
+    rows = 0
+
+    # Stream: resample each day partition and append it as its own row group
+    with pq.ParquetWriter(tmp_path, OHLCV_SCHEMA) as writer:
+        for chunk in iter_raw_chunks(interval, root=root):
+            bars = chunk.resample(rule, on='date').agg(OHLCV_AGG).dropna(subset=['close']).reset_index()
+            if not bars.empty:
+                writer.write_table(_as_schema(bars), row_group_size=ROW_GROUP_SIZE)
+                rows += len(bars)
+
+    os.replace(tmp_path, path)
+    return rows
+
+
+def read_rollup(rule, columns=None, start=None, end=None, root=DATA_DIR):
+    filters = []
+    if start is not None:
+        filters.append(("date", ">=", pd.Timestamp(start)))
+    if end is not None:
+        filters.append(("date", "<=", pd.Timestamp(end)))
+    return pq.read_table(rollup_path(rule, root), columns=columns,
+                         filters=filters or None, memory_map=True).to_pandas()
+
+
+def available_resolutions(root=DATA_DIR):
+    # Daily features come from the daily pipeline; intraday ones once they have been built
+    intraday = [rule for rule in ROLLUPS if rule != "1d"]
+    return ["1d"] + [rule for rule in intraday if os.path.exists(table_path(featured_table(rule), root))]
+
+
+def attach_fgi(bars, fgi):
+    # Each bar gets the most recent daily FGI published at or before it
+    bars = bars.sort_values('date').copy()
+    fgi = fgi.sort_values('date').copy()
+    bars['date'] = bars['date'].astype("datetime64[ns]")
+    fgi['date'] = fgi['date'].astype("datetime64[ns]")
+    merged = pd.merge_asof(bars, fgi, on='date', direction='backward').dropna(subset=['fgi_value'])
+    return merged.astype({'fgi_value': int})
+
+
+def merged_bars(rule, root=DATA_DIR):
+    bars = read_rollup(rule, root=root)
+    fgi = read_table("fgi_data", columns=['date', 'fgi_value', 'fgi_sentiment'], root=root)
+    return attach_fgi(bars, fgi)
@@ -0,0 +1,89 @@
+# data/live_price.py
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class Quote:
+    price: Optional[float] = None
+    fetched_at: Optional[float] = None
+    age: Optional[float] = None
+    stale: bool = True
+    error: Optional[str] = None
+    # No fetch has finished yet: no price, but nothing has failed either
+    loading: bool = False
+
+
+def yfinance_price(ticker="BTC-USD"):
+    import yfinance as yf
+    return float(yf.Ticker(ticker).history(period="1d")["Close"].iloc[-1])
+
+
+# One background thread per process refreshes the price every `interval`
+# seconds; every reader gets the cached value without touching the network.
+# `source` is any zero-argument callable returning a price.
+class LivePricePoller:
+    def __init__(self, source=yfinance_price, interval=60, ttl=None):
+        self.source = source
+        self.interval = interval
+        self.ttl = ttl if ttl is not None else 2 * interval
+
+        self._cond = threading.Condition()
+        self._inflight = False
+        self._price = None
+        self._fetched_at = None
+        self._error = None
+        self._attempts = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="live-price-poller", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+    def refresh(self, timeout=None):
+        # Concurrent callers share the request already in flight instead of starting another
+        with self._cond:
+            if self._inflight:
+                self._cond.wait_for(lambda: not self._inflight, timeout)
+                return
+            self._inflight = True
+
+        price, error = None, None
+        try:
+            price = float(self.source())
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+
+        with self._cond:
+            if price is not None:
+                self._price = price
+                self._fetched_at = time.time()
+            self._error = error
+            self._attempts += 1
+            self._inflight = False
+            self._cond.notify_all()
+
+    def get(self, wait=0):
+        # On a cold start, waits up to `wait` seconds for the first fetch to finish
+        with self._cond:
+            if wait and self._attempts == 0:
+                self._cond.wait_for(lambda: self._attempts > 0, wait)
+            if self._price is None:
+                return Quote(error=self._error, loading=self._attempts == 0)
+            age = time.time() - self._fetched_at
+            return Quote(self._price, self._fetched_at, age, age > self.ttl, self._error)
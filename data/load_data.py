@@ -1,20 +1,116 @@
-@st.cache_data
-def load_data():
-    df = pd.read_csv("data/featured_data.csv", parse_dates=["date"])
-    df.sort_values("date", inplace=True)
+# data/load_data.py
+
+import numpy as np
+import pandas as pd
+
+from data.assets import asset_columns, read_asset
+from data.store import featured_table, read_table, table_columns
+from instrumentation import instrument
+
+# Columns the dashboard reads; open/high/low stay on disk
+DASHBOARD_COLUMNS = [
+    "date", "close", "volume", "fgi_value", "fgi_sentiment",
+    "daily_return", "volatility_7d", "fgi_value_lag1", "fgi_sentiment_lag1",
+    "ma_7", "ma_30",
+]
+
+# Moving averages (and their windows) recomputed on read for feature tables
+# written before the indicator registry materialized them
+MOVING_AVERAGES = {"ma_7": 7, "ma_30": 30}
+
+# Rows missing any of these can't be used; longer-window indicators such as
+# ma_30 are allowed to be NaN at the start of the history
+MODEL_COLUMNS = [
+    "target", "daily_return", "volatility", "sentiment_encoded",
+    "fgi_value", "fgi_value_lag1", "fgi_sentiment_lag1",
+]
+
+# Simple encoding: Fear = 0, Neutral = 1, Greed = 2 (modify if you use other states)
+SENTIMENT_MAP = {'Fear': 0, 'Neutral': 1, 'Greed': 2}
+
+# alternative.me labels, least to most greedy
+SENTIMENT_DTYPE = pd.CategoricalDtype(["Extreme Fear", "Fear", "Neutral", "Greed", "Extreme Greed"], ordered=True)
+SENTIMENT_COLUMNS = ["fgi_sentiment", "fgi_sentiment_lag1"]
+
+
+@instrument
+def load_data(columns=DASHBOARD_COLUMNS, start=None, end=None, resolution="1d", ticker=None):
+    # `ticker` reads one asset from the multi-asset store (daily bars only)
+    if ticker is not None:
+        stored = asset_columns("featured", ticker)
+    else:
+        stored = table_columns(featured_table(resolution))
+    # Older tables lack some columns; read the ones they have
+    present = columns if columns is None else [col for col in columns if col in stored]
+
+    # A date filter would cut the windows short, so the moving averages are
+    # computed on the whole table and sliced afterwards
+    missing = [col for col in MOVING_AVERAGES
+               if col not in stored and (columns is None or col in columns and "close" in columns)]
+    window_start = None if missing else start
+    if ticker is not None:
+        df = read_asset("featured", ticker, columns=present, start=window_start, end=end)
+    else:
+        df = read_table(featured_table(resolution), columns=present, start=window_start, end=end)
+
+    if missing:
+        df = df.sort_values("date")
+        for col in missing:
+            df[col] = df['close'].rolling(window=MOVING_AVERAGES[col]).mean()
+        if start is not None:
+            df = df[df['date'] >= pd.Timestamp(start)]
     df.reset_index(drop=True, inplace=True)
+    return df
 
-    # Ensure required columns exist
-    if 'daily_return' not in df.columns:
-        df['daily_return'] = df['price'].pct_change()
 
+@instrument
+def build_model_frame(df):
+    # Columns the dashboard and the model expect on top of the stored features
+    df = df.sort_values("date").reset_index(drop=True)
+
+    if 'target' not in df.columns:
+        df['target'] = (df['close'].shift(-1) > df['close']).astype(int)
+    if 'daily_return' not in df.columns:
+        df['daily_return'] = df['close'].pct_change()
     if 'volatility' not in df.columns:
-        df['volatility'] = df['daily_return'].rolling(window=5).std()
+        # Materialized by feature engineering; only older tables lack it
+        if 'volatility_7d' in df.columns:
+            df['volatility'] = df['volatility_7d']
+        else:
+            df['volatility'] = df['daily_return'].rolling(window=7).std()
+    if 'sentiment_encoded' not in df.columns:
+        df['sentiment_encoded'] = df['fgi_sentiment'].map(SENTIMENT_MAP).astype(float)
 
-    if 'fgi_sentiment_lag1' not in df.columns:
-        df['fgi_sentiment_lag1'] = df['fgi_sentiment'].shift(1)
+    # Remove NaNs introduced by pct_change and rolling
+    df = df.dropna(subset=[col for col in MODEL_COLUMNS if col in df.columns])
 
-    # Drop rows with missing values in required model features
-    df.dropna(subset=['daily_return', 'volatility', 'fgi_sentiment_lag1'], inplace=True)
+    # Sorted date index so date ranges resolve by binary search
+    df.index = pd.DatetimeIndex(df['date'])
+    df.index.name = None
+    return apply_schema(df)
 
-    return df
+
+def apply_schema(df):
+    # Compact in-memory dtypes: categorical sentiment labels, float32 prices and
+    # features, small integers for the target and the 0-100 index
+    dtypes = {col: SENTIMENT_DTYPE for col in SENTIMENT_COLUMNS if col in df.columns}
+    dtypes.update({col: np.float32 for col in df.select_dtypes(include='floating').columns})
+    if 'target' in df.columns:
+        dtypes['target'] = np.int8
+    if 'fgi_value' in df.columns:
+        dtypes['fgi_value'] = np.int8
+    return df.astype(dtypes)
+
+
+def date_bounds(index, start=None, end=None):
+    # Positions of the rows between two dates in a sorted DatetimeIndex: the
+    # end day is included (intraday bars too), and None leaves that side open
+    lo = 0 if start is None else index.searchsorted(pd.Timestamp(start), side="left")
+    hi = len(index) if end is None else index.searchsorted(pd.Timestamp(end) + pd.Timedelta(days=1), side="left")
+    return lo, hi
+
+
+def slice_dates(df, start, end):
+    # A view, not a masked copy
+    lo, hi = date_bounds(df.index, start, end)
+    return df.iloc[lo:hi]
@@ -0,0 +1,154 @@
+# data/store.py
+
+import argparse
+import json
+import os
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from instrumentation import instrument
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+TABLES = ["btc_data", "fgi_data", "merged_data", "featured_data"]
+
+# Repeated labels are stored dictionary-encoded and come back as pandas categoricals
+CATEGORY_COLUMNS = ["fgi_sentiment", "fgi_sentiment_lag1"]
+ROW_GROUP_SIZE = 64_000
+
+
+def featured_table(resolution="1d"):
+    # Daily features keep the original table name; intraday ones are suffixed
+    return "featured_data" if resolution == "1d" else f"featured_data_{resolution}"
+
+
+def table_path(name, root=DATA_DIR):
+    return os.path.join(root, f"{name}.parquet")
+
+
+def csv_path(name, root=DATA_DIR):
+    return os.path.join(root, f"{name}.csv")
+
+
+def table_exists(name, root=DATA_DIR):
+    return os.path.exists(table_path(name, root)) or os.path.exists(csv_path(name, root))
+
+
+def atomic_write(path, write):
+    # Write to a temp file in the same directory, then rename over the target,
+    # so concurrent readers never see a half-written file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_json(path, default=None):
+    if not os.path.exists(path):
+        return default
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_json(path, obj, indent=None):
+    def write(tmp_path):
+        with open(tmp_path, "w") as f:
+            json.dump(obj, f, indent=indent)
+    atomic_write(path, write)
+
+
+def _typed(df):
+    df = df.copy()
+    df["date"] = pd.to_datetime(df["date"])
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def write_table(df, name, root=DATA_DIR):
+    # Sorted by date so row-group statistics let date filters skip whole groups
+    df = _typed(df).sort_values("date").reset_index(drop=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    atomic_write(table_path(name, root),
+                 lambda tmp_path: pq.write_table(table, tmp_path, row_group_size=ROW_GROUP_SIZE))
+
+
+@instrument
+def read_table(name, columns=None, start=None, end=None, root=DATA_DIR):
+    path = table_path(name, root)
+    if not os.path.exists(path):
+        migrate_csv(name, root)
+
+    # Date range is pushed down to the reader instead of masking after load
+    filters = []
+    if start is not None:
+        filters.append(("date", ">=", pd.Timestamp(start)))
+    if end is not None:
+        filters.append(("date", "<=", pd.Timestamp(end)))
+
+    table = pq.read_table(path, columns=columns, filters=filters or None, memory_map=True)
+    return table.to_pandas()
+
+
+def table_columns(name, root=DATA_DIR):
+    # Column names from the Parquet footer, without reading any data
+    path = table_path(name, root)
+    if not os.path.exists(path):
+        migrate_csv(name, root)
+    return pq.read_schema(path).names
+
+
+def migrate_csv(name, root=DATA_DIR):
+    source = csv_path(name, root)
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"No {name} table or CSV found in {root}")
+
+    df = pd.read_csv(source)
+
+    # Old btc_data.csv files carry a second header row (",BTC-USD,...");
+    # it has no date, and dropping it lets the price columns parse as numbers
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df = df.dropna(subset=["date"])
+    for col in df.columns:
+        if col != "date" and col not in CATEGORY_COLUMNS and df[col].dtype == object:
+            df[col] = pd.to_numeric(df[col])
+
+    write_table(df, name, root)
+    return len(df)
+
+
+def migrate_csvs(root=DATA_DIR):
+    migrated = {}
+    for name in TABLES:
+        if os.path.exists(csv_path(name, root)):
+            migrated[name] = migrate_csv(name, root)
+    return migrated
+
+
+def export_csvs(root=DATA_DIR):
+    for name in TABLES:
+        if os.path.exists(table_path(name, root)):
+            read_table(name, root=root).to_csv(csv_path(name, root), index=False)
+
+
+# Run if executed directly
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the columnar data store")
+    parser.add_argument("command", choices=["migrate", "export"],
+                        help="migrate: CSV -> Parquet, export: Parquet -> CSV")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        for name, rows in migrate_csvs().items():
+            print(f"✅ {name}: {rows} rows written to {table_path(name)}")
+    else:
+        export_csvs()
+        print(f"✅ Tables exported as CSV to {DATA_DIR}")
@@ -0,0 +1,168 @@
+# instrumentation.py
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+# Off unless BTC_INSTRUMENT is set. Read once at import: when off, `instrument`
+# hands back the undecorated function and `span` a shared no-op context, so
+# instrumented code runs exactly as before.
+ENABLED = os.environ.get("BTC_INSTRUMENT", "").lower() not in ("", "0", "false", "no")
+
+# Where batch scripts write their spans on exit: *.prom for Prometheus text
+# format, anything else for JSON lines
+OUTPUT_PATH = os.environ.get("BTC_INSTRUMENT_OUT")
+
+METRIC_PREFIX = "btc_sentiment"
+
+# Every span of the process (bounded), and the spans of the current dashboard rerun per thread
+_spans = deque(maxlen=10_000)
+_lock = threading.Lock()
+_local = threading.local()
+_NOOP = nullcontext()
+
+
+def _rows(obj):
+    # Row count of a DataFrame/Series/array, or None
+    shape = getattr(obj, "shape", None)
+    return shape[0] if shape else None
+
+
+def _first_rows(args, kwargs):
+    for value in (*args, *kwargs.values()):
+        rows = _rows(value)
+        if rows is not None:
+            return rows
+    return None
+
+
+@contextmanager
+def _measure(name, rows=None):
+    # Wall time, rows and tracemalloc peak (bytes above the allocation level at entry).
+    # tracemalloc's peak is process-wide, so nested spans hand their peak up to
+    # the enclosing span before resetting it.
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    current, peak = tracemalloc.get_traced_memory()
+    if stack:
+        stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+    tracemalloc.reset_peak()
+
+    entry = {"name": name, "rows": rows, "base": current, "peak": current}
+    stack.append(entry)
+    start = time.perf_counter()
+    try:
+        yield entry
+    finally:
+        seconds = time.perf_counter() - start
+        stack.pop()
+        peak = max(entry["peak"], tracemalloc.get_traced_memory()[1])
+        if stack:
+            stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+        _record({
+            "name": name,
+            "seconds": seconds,
+            "rows": entry["rows"],
+            "peak_bytes": peak - entry["base"],
+            "depth": len(stack),
+            "timestamp": time.time(),
+        })
+
+
+def _record(span):
+    with _lock:
+        _spans.append(span)
+    run = getattr(_local, "run", None)
+    if run is not None:
+        run.append(span)
+
+
+def span(name, rows=None):
+    # Context manager for a block; set `entry["rows"]` inside it if the count is known later
+    return _measure(name, rows) if ENABLED else _NOOP
+
+
+def _module_name(func):
+    # Scripts run with `python -m` report their dotted name rather than __main__
+    if func.__module__ == "__main__":
+        spec = getattr(sys.modules["__main__"], "__spec__", None)
+        if spec is not None:
+            return spec.name
+    return func.__module__
+
+
+def instrument(func=None, *, name=None):
+    # Decorator, bare or with a name; rows are taken from the first
+    # DataFrame/array argument, or from the result when there is none
+    def decorate(func):
+        if not ENABLED:
+            return func
+        label = name or f"{_module_name(func)}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _measure(label, _first_rows(args, kwargs)) as entry:
+                result = func(*args, **kwargs)
+                if entry["rows"] is None:
+                    entry["rows"] = _rows(result)
+                return result
+        return wrapper
+
+    return decorate(func) if func is not None else decorate
+
+
+def start_run():
+    # Collect this thread's spans from here on (one dashboard rerun)
+    _local.run = []
+    return _local.run
+
+
+def spans():
+    with _lock:
+        return list(_spans)
+
+
+def prometheus_text(records=None):
+    records = spans() if records is None else records
+    totals = {}
+    for record in records:
+        total = totals.setdefault(record["name"], {"count": 0, "seconds": 0.0, "rows": 0, "peak": 0})
+        total["count"] += 1
+        total["seconds"] += record["seconds"]
+        total["rows"] += record["rows"] or 0
+        total["peak"] = max(total["peak"], record["peak_bytes"])
+
+    lines = []
+    for metric, kind, key in (("call_seconds_sum", "counter", "seconds"),
+                              ("call_count", "counter", "count"),
+                              ("rows_total", "counter", "rows"),
+                              ("peak_bytes_max", "gauge", "peak")):
+        lines.append(f"# TYPE {METRIC_PREFIX}_{metric} {kind}")
+        for label, total in sorted(totals.items()):
+            lines.append(f'{METRIC_PREFIX}_{metric}{{name="{label}"}} {total[key]}')
+    return "\n".join(lines) + "\n"
+
+
+def write_spans(path):
+    records = spans()
+    with open(path, "w") as f:
+        if path.endswith(".prom"):
+            f.write(prometheus_text(records))
+        else:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+
+
+if ENABLED and OUTPUT_PATH:
+    atexit.register(write_spans, OUTPUT_PATH)
@@ -0,0 +1,121 @@
+# models/backtest.py
+
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from models.model import FEATURES
+
+# Feature matrix and labels, set once per worker process and only read by folds
+_shared = {}
+
+
+def _init_worker(X, y):
+    _shared['X'] = X
+    _shared['y'] = y
+
+
+def _fit_fold(fold):
+    train_start, test_start, test_end = fold
+    X, y = _shared['X'], _shared['y']
+    X_train, y_train = X[train_start:test_start], y[train_start:test_start]
+
+    # A window with a single class has nothing to separate; predict its base rate
+    if len(np.unique(y_train)) < 2:
+        return test_start, np.full(test_end - test_start, float(y_train.mean()))
+
+    scaler = StandardScaler().fit(X_train)
+    model = LogisticRegression().fit(scaler.transform(X_train), y_train)
+    return test_start, model.predict_proba(scaler.transform(X[test_start:test_end]))[:, 1]
+
+
+def make_folds(n_rows, min_train=180, refit_every=7, window=None):
+    # Each fold trains on the rows before `test_start` (all of them, or the last
+    # `window` rows) and predicts the next `refit_every` rows out of sample
+    folds = []
+    for test_start in range(min_train, n_rows, refit_every):
+        train_start = 0 if window is None else max(0, test_start - window)
+        folds.append((train_start, test_start, min(test_start + refit_every, n_rows)))
+    return folds
+
+
+def walk_forward(df, features=FEATURES, min_train=180, refit_every=7, window=None, max_workers=None):
+    df_model = df.dropna(subset=features + ['target'])
+
+    # The newest row has no next-day close yet, so its target is not a real label
+    df_model = df_model.iloc[:-1]
+
+    X = np.ascontiguousarray(df_model[features].to_numpy(dtype=float))
+    y = df_model['target'].to_numpy(dtype=int)
+    folds = make_folds(len(X), min_train, refit_every, window)
+
+    proba = np.full(len(X), np.nan)
+    if max_workers == 1:
+        _init_worker(X, y)
+        fold_results = [_fit_fold(fold) for fold in folds]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(X, y)) as pool:
+            chunksize = max(1, len(folds) // (4 * (max_workers or os.cpu_count() or 1)))
+            fold_results = list(pool.map(_fit_fold, folds, chunksize=chunksize))
+
+    for test_start, fold_proba in fold_results:
+        proba[test_start:test_start + len(fold_proba)] = fold_proba
+
+    results = pd.DataFrame({
+        "date": df_model['date'].to_numpy(),
+        "prob_up": proba,
+        "actual": y,
+        "regime": df_model['fgi_sentiment'].astype(str).to_numpy(),
+    })
+    results = results.dropna(subset=["prob_up"]).reset_index(drop=True)
+    results['predicted'] = (results['prob_up'] >= 0.5).astype(int)
+    results['correct'] = (results['predicted'] == results['actual']).astype(int)
+    return results
+
+
+def summarize(results, bins=10):
+    prob, actual = results['prob_up'], results['actual']
+
+    calibration = results.groupby(
+        pd.cut(prob, np.linspace(0, 1, bins + 1), include_lowest=True), observed=True
+    ).agg(mean_prob=('prob_up', 'mean'), hit_freq=('actual', 'mean'), days=('actual', 'size'))
+
+    by_regime = results.groupby('regime', observed=True).agg(
+        accuracy=('correct', 'mean'),
+        days=('correct', 'size')
+    )
+
+    return {
+        "hit_rate": results['correct'].mean(),
+        "brier": ((prob - actual) ** 2).mean(),
+        "calibration": calibration,
+        "by_regime": by_regime,
+    }
+
+
+# Run if executed directly
+if __name__ == "__main__":
+    from data.load_data import build_model_frame, load_data
+
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the logistic model")
+    parser.add_argument("--min-train", type=int, default=180, help="rows before the first out-of-sample day")
+    parser.add_argument("--refit-every", type=int, default=7, help="rows predicted per refit")
+    parser.add_argument("--window", type=int, default=None, help="rolling training window (default: expanding)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    df = build_model_frame(load_data())
+    results = walk_forward(df, min_train=args.min_train, refit_every=args.refit_every,
+                           window=args.window, max_workers=args.workers)
+    summary = summarize(results)
+
+    print(f"Out-of-sample days: {len(results)}")
+    print(f"Hit rate: {summary['hit_rate']:.2%}   Brier score: {summary['brier']:.4f}")
+    print("\nCalibration:")
+    print(summary['calibration'])
+    print("\nAccuracy by regime:")
+    print(summary['by_regime'])
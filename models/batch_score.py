@@ -0,0 +1,92 @@
+# models/batch_score.py
+
+import argparse
+import glob
+import os
+import time
+import joblib
+import numpy as np
+import pandas as pd
+
+from models.model import FEATURES, run_logistic_model
+from models.prediction import ARTIFACT_DIR, load_or_fit_model, model_version, training_key
+from models.prediction_store import BACKFILL, DB_PATH, open_store
+
+
+def is_training_key(name):
+    return len(name) == 16 and all(c in "0123456789abcdef" for c in name)
+
+
+def latest_artifact(artifact_dir=ARTIFACT_DIR):
+    # Batch models only: their files are named by training key, unlike other
+    # checkpoints (e.g. the online model) that may sit in the same directory
+    paths = [path for path in glob.glob(os.path.join(artifact_dir, "*.joblib"))
+             if is_training_key(os.path.splitext(os.path.basename(path))[0])]
+    return max(paths, key=os.path.getmtime) if paths else None
+
+
+def load_scoring_model(df, path=None, artifact_dir=ARTIFACT_DIR):
+    # Artifacts are logistic models over FEATURES, named by their training key;
+    # with none saved yet, one is fitted
+    path = path or latest_artifact(artifact_dir)
+    if path is not None:
+        model, scaler, accuracy, _ = joblib.load(path)
+        return model, scaler, accuracy, os.path.splitext(os.path.basename(path))[0]
+
+    key = training_key(run_logistic_model, df)
+    model, scaler, accuracy, _ = load_or_fit_model(run_logistic_model, df, artifact_dir, key=key)
+    return model, scaler, accuracy, key
+
+
+def score_range(df, model, scaler, accuracy, version, key, start=None, end=None):
+    # The realised direction needs the next close, so look it up before slicing
+    next_close = df['close'].shift(-1)
+    scored = df.assign(next_close=next_close)
+    if start is not None:
+        scored = scored[scored['date'] >= pd.Timestamp(start)]
+    if end is not None:
+        scored = scored[scored['date'] <= pd.Timestamp(end)]
+    scored = scored.dropna(subset=FEATURES)
+
+    # One transform and one predict_proba over the whole range
+    proba = model.predict_proba(scaler.transform(scored[FEATURES]))[:, 1]
+    predicted = (proba >= 0.5).astype(int)
+
+    actual = (scored['next_close'] > scored['close']).astype(int).to_numpy()
+    known = scored['next_close'].notna().to_numpy()
+    is_correct = np.where(known, (predicted == actual).astype(float), np.nan)
+
+    return pd.DataFrame({
+        "date": scored['date'].dt.strftime("%Y-%m-%d").to_numpy(),
+        "model_version": version,
+        "predicted_direction": predicted,
+        "is_correct": is_correct,
+        "accuracy": accuracy,
+        "probability": proba,
+        "training_key": key,
+        "source": BACKFILL,
+    })
+
+
+# Run if executed directly
+if __name__ == "__main__":
+    from data.load_data import build_model_frame, load_data
+
+    parser = argparse.ArgumentParser(description="Score a date range with a saved model and backfill predictions")
+    parser.add_argument("--model", default=None, help="joblib artifact (default: newest in models/artifacts, fitted if none)")
+    parser.add_argument("--start", default=None, help="first date to score (YYYY-MM-DD)")
+    parser.add_argument("--end", default=None, help="last date to score (YYYY-MM-DD)")
+    parser.add_argument("--db", default=DB_PATH, help="prediction store to write into")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    df = build_model_frame(load_data())
+
+    model, scaler, accuracy, key = load_scoring_model(df, args.model)
+    scored = score_range(df, model, scaler, accuracy, model_version(run_logistic_model), key, args.start, args.end)
+
+    # One transaction; backfilled dates replace earlier backfills but never live
+    # predictions, and stay out of the store's accuracy totals
+    open_store(args.db).upsert(scored)
+
+    print(f"✅ Scored {len(scored)} days into {args.db} in {time.perf_counter() - started:.2f}s")
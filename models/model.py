@@ -5,9 +5,14 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 
+from instrumentation import instrument
+
+FEATURES = ['fgi_value', 'fgi_value_lag1', 'volatility', 'sentiment_encoded']
+
+@instrument
 def run_logistic_model(df):
     # Select features and target
-    features = ['fgi_value', 'fgi_value_lag1', 'volatility', 'sentiment_encoded']
+    features = FEATURES
     df_model = df.dropna(subset=features + ['target'])
 
     X = df_model[features]
@@ -1,42 +1,98 @@
 # models/prediction.py
 
+import hashlib
 import os
 import pandas as pd
+import joblib
 from datetime import datetime
 
-def load_or_create_prediction(run_model_func, df):
-    model, scaler, accuracy, coefs = run_model_func(df)
+from data.store import atomic_write
+from models.model import FEATURES
+from models.prediction_store import open_store
+from instrumentation import instrument
+
+ARTIFACT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts")
+
+# Fitted models already loaded by this process, keyed like the artifacts on disk
+_loaded = {}
+
+
+def training_key(run_model_func, df, features=FEATURES):
+    # Same model function, feature list and training rows -> same fitted model
+    digest = hashlib.sha256()
+    digest.update(f"{run_model_func.__module__}.{run_model_func.__qualname__}".encode())
+    digest.update(",".join(features).encode())
+    digest.update(pd.util.hash_pandas_object(df[features + ['target']], index=False).values.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def model_version(run_model_func, features=FEATURES):
+    # Names the model, not its training data: stays the same across data
+    # refreshes, so the store keeps one prediction per date for it
+    digest = hashlib.sha256(",".join(features).encode()).hexdigest()[:8]
+    return f"{run_model_func.__name__}-{digest}"
+
+
+@instrument
+def load_or_fit_model(run_model_func, df, artifact_dir=ARTIFACT_DIR, key=None):
+    key = key or training_key(run_model_func, df)
+    if key in _loaded:
+        return _loaded[key]
+
+    path = os.path.join(artifact_dir, f"{key}.joblib")
+    if os.path.exists(path):
+        result = joblib.load(path)
+    else:
+        result = run_model_func(df)
+        os.makedirs(artifact_dir, exist_ok=True)
+        atomic_write(path, lambda tmp_path: joblib.dump(result, tmp_path))
+
+    _loaded[key] = result
+    return result
+
+
+@instrument
+def load_or_create_prediction(run_model_func, df, store=None, artifact_dir=ARTIFACT_DIR):
+    key = training_key(run_model_func, df)
+    model, scaler, accuracy, coefs = load_or_fit_model(run_model_func, df, artifact_dir, key=key)
 
     # Predict next-day direction using today’s row
-    today_row = df.iloc[-1:][['fgi_value', 'fgi_value_lag1', 'volatility', 'sentiment_encoded']]
+    today_row = df.iloc[-1:][FEATURES]
     if today_row.isnull().any().any():
         return None, 0.0, None
 
     X_today = scaler.transform(today_row)
     prediction = model.predict(X_today)[0]
+    probability = float(model.predict_proba(X_today)[0, 1])
 
     # Save historical prediction
-    save_path = "data/predictions.csv"
-    correct = "N/A"
+    record_prediction(df, model_version(run_model_func), int(prediction), probability, accuracy, key, store)
+    return prediction, accuracy, coefs
+
+
+def record_prediction(df, version, prediction, probability, accuracy, key=None, store=None):
+    # Today's call for `version`, scored against the last close move in `df`
+    correct = None
     if len(df) >= 2:
         yesterday_close = df.iloc[-2]['close']
         today_close = df.iloc[-1]['close']
         true_movement = int(today_close > yesterday_close)
         correct = int(true_movement == prediction)
 
-    new_row = pd.DataFrame([{
+    new_row = {
         "date": datetime.now().strftime("%Y-%m-%d"),
+        "model_version": version,
         "predicted_direction": prediction,
+        "probability": probability,
         "is_correct": correct,
-        "accuracy": accuracy
-    }])
-
-    if os.path.exists(save_path):
-        history = pd.read_csv(save_path)
-        history = pd.concat([history, new_row], ignore_index=True)
-    else:
-        history = new_row
+        "accuracy": float(accuracy),
+        "training_key": key,
+    }
 
-    history.to_csv(save_path, index=False)
-
-    return prediction, accuracy, coefs
+    # One row per (date, model version); reruns that reproduce it skip the write,
+    # a refit on refreshed data replaces it
+    store = store or open_store()
+    existing = store.get(new_row["date"], version)
+    if existing is None or any(existing[col] != new_row[col] for col in ("predicted_direction", "is_correct", "accuracy", "training_key")):
+        store.upsert([new_row])
+    return new_row
@@ -0,0 +1,219 @@
+# models/prediction_store.py
+
+import argparse
+import os
+import sqlite3
+from contextlib import contextmanager
+import pandas as pd
+
+from data.store import DATA_DIR
+
+DB_PATH = os.path.join(DATA_DIR, "predictions.db")
+
+# Prediction histories kept as CSV before the store existed, and the
+# model_version their rows are imported under
+LEGACY_CSVS = {
+    os.path.join(DATA_DIR, "predictions.csv"): "legacy",
+    os.path.join(os.path.dirname(DATA_DIR), "model.predictions.csv"): "legacy_model_predictions",
+}
+
+# Where a row came from: "live" predictions are made before the outcome is
+# known; "backfill" rows are scored after the fact by models.batch_score, on
+# data the model was trained on, so they stay out of the accuracy totals
+LIVE, BACKFILL = "live", "backfill"
+
+# model_version names the model (stable across data refreshes); training_key
+# is the hash of the data it was fitted on
+COLUMNS = ["date", "model_version", "predicted_direction", "probability", "is_correct", "accuracy",
+           "training_key", "source"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    date TEXT NOT NULL,
+    model_version TEXT NOT NULL,
+    predicted_direction INTEGER NOT NULL,
+    probability REAL,
+    is_correct INTEGER,
+    accuracy REAL,
+    training_key TEXT,
+    source TEXT NOT NULL DEFAULT 'live'
+);
+CREATE UNIQUE INDEX IF NOT EXISTS predictions_date_model ON predictions (date, model_version);
+
+-- Running totals of live predictions per model version, kept up to date by the
+-- triggers below (no INSERT OR IGNORE in them: an upsert's conflict handling
+-- would override it)
+CREATE TABLE IF NOT EXISTS accuracy_stats (
+    model_version TEXT PRIMARY KEY,
+    scored INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS predictions_insert AFTER INSERT ON predictions BEGIN
+    INSERT INTO accuracy_stats (model_version) SELECT NEW.model_version
+    WHERE NOT EXISTS (SELECT 1 FROM accuracy_stats WHERE model_version = NEW.model_version);
+    UPDATE accuracy_stats
+    SET scored = scored + (NEW.is_correct IS NOT NULL AND NEW.source = 'live'),
+        correct = correct + (NEW.source = 'live') * COALESCE(NEW.is_correct, 0)
+    WHERE model_version = NEW.model_version;
+END;
+
+CREATE TRIGGER IF NOT EXISTS predictions_update AFTER UPDATE ON predictions BEGIN
+    UPDATE accuracy_stats
+    SET scored = scored - (OLD.is_correct IS NOT NULL AND OLD.source = 'live'),
+        correct = correct - (OLD.source = 'live') * COALESCE(OLD.is_correct, 0)
+    WHERE model_version = OLD.model_version;
+    INSERT INTO accuracy_stats (model_version) SELECT NEW.model_version
+    WHERE NOT EXISTS (SELECT 1 FROM accuracy_stats WHERE model_version = NEW.model_version);
+    UPDATE accuracy_stats
+    SET scored = scored + (NEW.is_correct IS NOT NULL AND NEW.source = 'live'),
+        correct = correct + (NEW.source = 'live') * COALESCE(NEW.is_correct, 0)
+    WHERE model_version = NEW.model_version;
+END;
+
+CREATE TRIGGER IF NOT EXISTS predictions_delete AFTER DELETE ON predictions BEGIN
+    UPDATE accuracy_stats
+    SET scored = scored - (OLD.is_correct IS NOT NULL AND OLD.source = 'live'),
+        correct = correct - (OLD.source = 'live') * COALESCE(OLD.is_correct, 0)
+    WHERE model_version = OLD.model_version;
+END;
+"""
+
+UPSERT = """
+INSERT INTO predictions (date, model_version, predicted_direction, probability, is_correct, accuracy, training_key, source)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (date, model_version) DO UPDATE SET
+    predicted_direction = excluded.predicted_direction,
+    probability = excluded.probability,
+    is_correct = excluded.is_correct,
+    accuracy = excluded.accuracy,
+    training_key = excluded.training_key,
+    source = excluded.source
+-- A backfill never replaces a live prediction
+WHERE excluded.source = 'live' OR predictions.source = excluded.source
+"""
+
+
+
+def _clean(value):
+    # "N/A" and NaN both mean "not known yet"
+    if value is None or value == "N/A" or (isinstance(value, float) and value != value):
+        return None
+    return value
+
+
+def _row(record):
+    return (
+        str(record["date"])[:10],
+        str(record["model_version"]),
+        int(record["predicted_direction"]),
+        _clean(record.get("probability")),
+        None if _clean(record.get("is_correct")) is None else int(record["is_correct"]),
+        _clean(record.get("accuracy")),
+        _clean(record.get("training_key")),
+        _clean(record.get("source")) or LIVE,
+    )
+
+
+class PredictionStore:
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        with self._connect() as conn:
+            # WAL lets dashboard sessions read while another one writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # A short-lived connection per call is safe across Streamlit's threads
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def upsert(self, records):
+        if isinstance(records, pd.DataFrame):
+            records = records.to_dict("records")
+        rows = [_row(record) for record in records]
+        with self._connect() as conn:
+            conn.executemany(UPSERT, rows)
+        return len(rows)
+
+    def get(self, date, model_version):
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM predictions WHERE date = ? AND model_version = ?",
+                (str(date)[:10], model_version),
+            ).fetchone()
+        return None if row is None else dict(zip(COLUMNS, row))
+
+    def range(self, start=None, end=None, model_version=None, source=None):
+        # Served by the (date, model_version) index
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(str(start)[:10])
+        if end is not None:
+            clauses.append("date <= ?")
+            params.append(str(end)[:10])
+        if model_version is not None:
+            clauses.append("model_version = ?")
+            params.append(model_version)
+        if source is not None:
+            clauses.append("source = ?")
+            params.append(source)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._connect() as conn:
+            df = pd.read_sql_query(f"SELECT {', '.join(COLUMNS)} FROM predictions {where} ORDER BY date", conn, params=params)
+        df["date"] = pd.to_datetime(df["date"])
+        return df
+
+    def accuracy(self, model_version=None):
+        # Live predictions only, read from the running totals rather than a scan
+        with self._connect() as conn:
+            if model_version is None:
+                scored, correct = conn.execute("SELECT SUM(scored), SUM(correct) FROM accuracy_stats").fetchone()
+            else:
+                row = conn.execute("SELECT scored, correct FROM accuracy_stats WHERE model_version = ?",
+                                   (model_version,)).fetchone()
+                scored, correct = row if row else (0, 0)
+        return (correct / scored) if scored else None
+
+    def is_empty(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM predictions LIMIT 1").fetchone() is None
+
+    def import_csv(self, csv_path, model_version):
+        history = pd.read_csv(csv_path, dtype={"date": str})
+        # model.predictions.csv names the prediction column "predicted"
+        if "predicted_direction" not in history.columns and "predicted" in history.columns:
+            history = history.rename(columns={"predicted": "predicted_direction"})
+        history["model_version"] = model_version
+        return self.upsert(history)
+
+
+def open_store(path=DB_PATH, legacy_csvs=LEGACY_CSVS):
+    # The first open imports the old CSV histories so nothing is lost
+    store = PredictionStore(path)
+    if store.is_empty():
+        for csv_path, model_version in legacy_csvs.items():
+            if os.path.exists(csv_path):
+                store.import_csv(csv_path, model_version)
+    return store
+
+
+# Run if executed directly
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect the prediction store")
+    parser.add_argument("--db", default=DB_PATH)
+    args = parser.parse_args()
+
+    store = open_store(args.db)
+    history = store.range()
+    print(history.tail())
+    accuracy = store.accuracy()
+    print(f"✅ {len(history)} predictions in {args.db}; accuracy {'n/a' if accuracy is None else f'{accuracy:.2%}'}")
@@ -0,0 +1,150 @@
+# models/sweep.py
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import TimeSeriesSplit
+from sklearn.preprocessing import StandardScaler
+
+from data.store import DATA_DIR
+from models.model import FEATURES
+
+LEADERBOARD_PATH = os.path.join(DATA_DIR, "sweep_leaderboard.csv")
+
+# FEATURES already carries the 7-day volatility; the extras are registry
+# columns from scripts/indicators.py the logistic model does not use
+CANDIDATE_FEATURES = FEATURES + ['daily_return', 'return_7d', 'rsi_14']
+
+# Classifier name -> (constructor, parameter grid)
+MODELS = {
+    "logistic": (LogisticRegression, {"C": [0.01, 0.1, 1.0, 10.0], "max_iter": [1000]}),
+    "random_forest": (RandomForestClassifier, {"n_estimators": [200], "max_depth": [3, 5], "random_state": [42]}),
+    "gradient_boosting": (GradientBoostingClassifier, {"n_estimators": [100], "max_depth": [2, 3], "random_state": [42]}),
+}
+
+# Scaled fold matrices, set once per worker process and only read by candidates
+_shared = {}
+
+
+def _init_worker(folds):
+    _shared['folds'] = folds
+
+
+def build_folds(df, features=CANDIDATE_FEATURES, n_splits=5):
+    # Scale every candidate column once per fold. Standardisation is per column,
+    # so slicing a subset out of these matrices equals scaling the subset alone
+    df_model = df.dropna(subset=features + ['target']).iloc[:-1]
+    X = df_model[features].to_numpy(dtype=float)
+    y = df_model['target'].to_numpy(dtype=int)
+
+    folds = []
+    for train_idx, test_idx in TimeSeriesSplit(n_splits=n_splits).split(X):
+        scaler = StandardScaler().fit(X[train_idx])
+        folds.append((scaler.transform(X[train_idx]), y[train_idx], scaler.transform(X[test_idx]), y[test_idx]))
+    return folds, df_model
+
+
+def data_key(df_model, features=CANDIDATE_FEATURES):
+    digest = hashlib.sha256(pd.util.hash_pandas_object(df_model[features + ['target']], index=False).values.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def make_grid(features=CANDIDATE_FEATURES, models=MODELS):
+    grid = []
+    subsets = [list(s) for r in range(1, len(features) + 1) for s in itertools.combinations(features, r)]
+    for name, (_, param_grid) in models.items():
+        keys = sorted(param_grid)
+        for values in itertools.product(*(param_grid[k] for k in keys)):
+            params = dict(zip(keys, values))
+            for subset in subsets:
+                grid.append({"model": name, "params": params, "features": subset})
+    return grid
+
+
+def cv_spec(n_splits):
+    # Everything that decides how a configuration is scored, besides the data
+    return {"splitter": "TimeSeriesSplit", "n_splits": n_splits}
+
+
+def config_id(config, key, cv):
+    payload = json.dumps([config["model"], config["params"], config["features"], key, cv], sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def _evaluate(config, columns):
+    constructor = MODELS[config["model"]][0]
+    scores = []
+    for X_train, y_train, X_test, y_test in _shared['folds']:
+        model = constructor(**config["params"]).fit(X_train[:, columns], y_train)
+        scores.append(model.score(X_test[:, columns], y_test))
+    return float(np.mean(scores)), float(np.std(scores)), len(scores)
+
+
+def load_leaderboard(path=LEADERBOARD_PATH):
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=["config_id", "data_key", "model", "params", "features",
+                                     "mean_accuracy", "std_accuracy", "n_folds"])
+    return pd.read_csv(path)
+
+
+def run_sweep(df, grid=None, n_splits=5, max_workers=None, path=LEADERBOARD_PATH):
+    folds, df_model = build_folds(df, n_splits=n_splits)
+    key = data_key(df_model)
+    cv = cv_spec(n_splits)
+    grid = grid if grid is not None else make_grid()
+
+    # Skip configurations already scored on this exact data under the same CV
+    done = set(load_leaderboard(path)["config_id"])
+    todo = [(config_id(config, key, cv), config) for config in grid]
+    todo = [(cid, config) for cid, config in todo if cid not in done]
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(folds,)) as pool:
+        futures = {
+            pool.submit(_evaluate, config, [CANDIDATE_FEATURES.index(f) for f in config["features"]]): (cid, config)
+            for cid, config in todo
+        }
+        for future in as_completed(futures):
+            cid, config = futures[future]
+            mean_acc, std_acc, n_folds = future.result()
+            row = pd.DataFrame([{
+                "config_id": cid,
+                "data_key": key,
+                "model": config["model"],
+                "params": json.dumps(config["params"], sort_keys=True),
+                "features": "+".join(config["features"]),
+                "mean_accuracy": mean_acc,
+                "std_accuracy": std_acc,
+                "n_folds": n_folds,
+            }])
+            # Appended as each result lands, so an interrupted sweep keeps its progress
+            row.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+
+    leaderboard = load_leaderboard(path)
+    leaderboard = leaderboard[(leaderboard["data_key"] == key) & (leaderboard["n_folds"] == n_splits)]
+    return leaderboard.sort_values("mean_accuracy", ascending=False).reset_index(drop=True), len(todo)
+
+
+# Run if executed directly
+if __name__ == "__main__":
+    from data.load_data import build_model_frame, load_data
+
+    parser = argparse.ArgumentParser(description="Sweep feature subsets and classifiers")
+    parser.add_argument("--splits", type=int, default=5, help="time-series CV folds")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--top", type=int, default=10, help="leaderboard rows to print")
+    args = parser.parse_args()
+
+    # Every stored column, so the registry columns are there to sweep over
+    df = build_model_frame(load_data(columns=None))
+    leaderboard, evaluated = run_sweep(df, n_splits=args.splits, max_workers=args.workers)
+
+    print(f"Evaluated {evaluated} new configurations")
+    print(leaderboard.head(args.top)[["model", "params", "features", "mean_accuracy", "std_accuracy"]])
+    print(f"✅ Leaderboard saved to {LEADERBOARD_PATH}")
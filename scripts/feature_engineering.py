@@ -1,28 +1,198 @@
+import argparse
+import os
+
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 
-def create_features(merged_path="data/merged_data.csv"):
-    df = pd.read_csv(merged_path, parse_dates=["date"])
-    df = df.sort_values("date")
+from data.assets import read_asset, stored_tickers, write_asset
+from data.store import DATA_DIR, featured_table, load_json, read_table, save_json, table_path, write_table
+from instrumentation import instrument
+from scripts.indicators import FLOAT_SOURCES, INDICATORS, compute_indicators, max_lookback, signature
 
-    # Daily returns (percentage)
-    df['daily_return'] = df['close'].pct_change() * 100
+FEATURE_STATE = ".feature_state.json"
 
-    # Rolling 7-day volatility (standard deviation of returns)
-    df['volatility_7d'] = df['daily_return'].rolling(window=7).std()
+# Rows of history carried between incremental runs
+LOOKBACK = max_lookback()
 
-    # Lag features (yesterday’s FGI value & sentiment)
-    df['fgi_value_lag1'] = df['fgi_value'].shift(1)
-    df['fgi_sentiment_lag1'] = df['fgi_sentiment'].shift(1)
+# The original feature columns; rows without them are dropped. Longer windows
+# (ma_30, return_30d, ...) stay NaN at the start of the history instead.
+REQUIRED_COLUMNS = ['daily_return', 'volatility_7d', 'fgi_value_lag1', 'fgi_sentiment_lag1']
+
+# Indicators of the daily sentiment series (lags, changes). FGI is published
+# once a day, so at bar resolution these are computed on the daily series and
+# joined onto the bars: "lag1" is yesterday's FGI, not the previous bar's.
+FGI_INDICATORS = [ind for ind in INDICATORS if ind.source in ("fgi_value", "fgi_sentiment")]
+
+
+def _history(state):
+    # Raw columns of the rows just before the chunk being computed
+    if not state:
+        return {"close": [], "fgi_value": [], "fgi_sentiment": []}
+    return {"close": state['closes'], "fgi_value": state['fgi_values'], "fgi_sentiment": state['fgi_sentiments']}
 
-    # Drop rows with NaN due to lag/rolling
-    df.dropna(inplace=True)
-    df.reset_index(drop=True, inplace=True)
 
+@instrument
+def compute_features(df, state=None):
+    # `state` carries the rows just before `df`, so a chunk of new rows gets
+    # the same values it would get as part of the whole history
+    df = df.sort_values("date").reset_index(drop=True)
+    history = _history(state)
+    n_prev = len(history['close'])
+
+    # Contiguous float32 inputs, history first
+    columns = {
+        col: np.ascontiguousarray(np.concatenate([np.asarray(history[col], dtype=np.float32),
+                                                  df[col].to_numpy(dtype=np.float32)]))
+        for col in FLOAT_SOURCES
+    }
+    columns['fgi_sentiment'] = np.array(list(history['fgi_sentiment']) + df['fgi_sentiment'].astype(object).tolist(),
+                                        dtype=object)
+
+    for name, values in compute_indicators(columns).items():
+        df[name] = values[n_prev:]
     return df
 
+
+def attach_daily_fgi_features(bars, fgi):
+    fgi = fgi.sort_values("date").reset_index(drop=True)
+    columns = {
+        "fgi_value": fgi['fgi_value'].to_numpy(dtype=np.float32),
+        "fgi_sentiment": fgi['fgi_sentiment'].astype(object).to_numpy(),
+    }
+    daily = pd.DataFrame(compute_indicators(columns, FGI_INDICATORS))
+    daily['date'] = fgi['date'].astype("datetime64[ns]")
+
+    names = [ind.name for ind in FGI_INDICATORS]
+    bars = bars.sort_values("date").reset_index(drop=True)
+    merged = pd.merge_asof(bars.drop(columns=names).astype({"date": "datetime64[ns]"}), daily,
+                           on="date", direction="backward")
+    return merged[bars.columns]
+
+
+def feature_state(merged):
+    # The trailing raw rows every indicator window can still reach into
+    tail = merged.sort_values("date").tail(LOOKBACK)
+    return {
+        "indicators": signature(),
+        "dates": tail['date'].dt.strftime("%Y-%m-%d").tolist(),
+        "closes": tail['close'].to_numpy(dtype=float).tolist(),
+        "fgi_values": tail['fgi_value'].to_numpy(dtype=float).tolist(),
+        "fgi_sentiments": tail['fgi_sentiment'].astype(str).tolist(),
+    }
+
+
+def _drop_incomplete(df):
+    # Drop rows with NaN due to lag/rolling
+    df = df.dropna(subset=REQUIRED_COLUMNS)
+    df = df.reset_index(drop=True)
+    return df
+
+
+@instrument
+def create_features(root=DATA_DIR, resolution="1d"):
+    if resolution == "1d":
+        return _drop_incomplete(compute_features(read_table("merged_data", root=root)))
+
+    # Intraday bars with the daily FGI attached as of each bar; its lags and
+    # changes are then taken by day
+    from data.intraday import merged_bars
+    features = compute_features(merged_bars(resolution, root=root))
+    fgi = read_table("fgi_data", columns=['date', 'fgi_value', 'fgi_sentiment'], root=root)
+    return _drop_incomplete(attach_daily_fgi_features(features, fgi))
+
+
+def _asset_features(ticker, root):
+    # Runs in a worker process: reads and writes only this asset's partitions
+    features = _drop_incomplete(compute_features(read_asset("merged", ticker, root=root)))
+    write_asset(features, "featured", ticker, root)
+    return ticker, len(features)
+
+
+@instrument
+def create_asset_features(tickers=None, root=DATA_DIR, max_workers=None):
+    # Assets are independent series, so each one gets its own process
+    stored = stored_tickers("merged", root)
+    tickers = [ticker for ticker in (tickers or stored) if ticker in stored]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return dict(pool.map(_asset_features, tickers, [root] * len(tickers)))
+
+
+def _state_matches(state, merged_tail):
+    # Overlapping re-fetches can revise recent candles; the saved tail must still
+    # match the merged table, otherwise the carried-over state is stale. A state
+    # from another indicator registry means the stored columns are stale too.
+    if state.get('indicators') != signature():
+        return False
+    stored = merged_tail[merged_tail['date'] <= pd.Timestamp(state['dates'][-1])]
+    return (
+        stored['date'].dt.strftime("%Y-%m-%d").tolist() == state['dates']
+        and stored['close'].to_numpy(dtype=float).tolist() == state['closes']
+        and stored['fgi_value'].to_numpy(dtype=float).tolist() == state['fgi_values']
+    )
+
+
+def _uncategorize(df):
+    return df.astype({col: object for col in df.select_dtypes("category").columns})
+
+
+def _same_features(a, b):
+    a, b = _uncategorize(a), _uncategorize(b)
+    try:
+        pd.testing.assert_frame_equal(a, b, check_exact=True, check_dtype=False)
+    except AssertionError:
+        return False
+    return True
+
+
+@instrument
+def update_features(root=DATA_DIR, verify=False):
+    state = load_json(os.path.join(root, FEATURE_STATE))
+    have_features = os.path.exists(table_path("featured_data", root))
+    merged_tail = read_table("merged_data", start=state['dates'][0], root=root) if state else None
+
+    if state is None or not have_features or not _state_matches(state, merged_tail):
+        # No usable state: fall back to a full recompute
+        merged = read_table("merged_data", root=root)
+        features = _drop_incomplete(compute_features(merged))
+        added = len(features)
+    else:
+        new_rows = merged_tail[merged_tail['date'] > pd.Timestamp(state['dates'][-1])]
+        new_features = _drop_incomplete(compute_features(new_rows, state))
+        # Only the new rows are computed, but the table is still read and
+        # rewritten whole: a Parquet file cannot be appended to
+        stored = read_table("featured_data", root=root)
+        features = pd.concat([_uncategorize(stored), new_features], ignore_index=True)
+        merged = merged_tail
+        added = len(new_features)
+
+    if verify and not _same_features(features, create_features(root)):
+        raise AssertionError("Incremental features differ from a full recompute")
+
+    write_table(features, "featured_data", root)
+    save_json(os.path.join(root, FEATURE_STATE), feature_state(merged))
+    return features, added
+
+
 # Run if executed directly
 if __name__ == "__main__":
-    features_df = create_features()
+    parser = argparse.ArgumentParser(description="Build the feature table from the merged data")
+    parser.add_argument("--full", action="store_true", help="recompute every row instead of only the new dates")
+    parser.add_argument("--verify", action="store_true", help="check the incremental result against a full recompute")
+    parser.add_argument("--resolution", default="1d", help="bar size; intraday ones (1h, 4h) are always recomputed in full")
+    args = parser.parse_args()
+
+    if args.resolution != "1d":
+        features_df = create_features(resolution=args.resolution)
+        write_table(features_df, featured_table(args.resolution))
+        added = len(features_df)
+    elif args.full:
+        features_df = create_features()
+        write_table(features_df, "featured_data")
+        save_json(os.path.join(DATA_DIR, FEATURE_STATE), feature_state(read_table("merged_data")))
+        added = len(features_df)
+    else:
+        features_df, added = update_features(verify=args.verify)
+
     print(features_df[["date", "close", "daily_return", "volatility_7d", "fgi_value", "fgi_value_lag1"]].tail())
-    features_df.to_csv("data/featured_data.csv", index=False)
-    print("✅ Feature-engineered data saved to data/featured_data.csv")
+    print(f"✅ Feature-engineered data saved to {table_path(featured_table(args.resolution))} ({added} rows added)")
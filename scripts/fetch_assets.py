@@ -0,0 +1,125 @@
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import yfinance as yf
+import pandas as pd
+
+from data.assets import DEFAULT_TICKERS, asset_path, read_asset, stored_tickers, table_dir, write_asset
+from data.store import DATA_DIR
+from scripts.fetch_btc import BTC_COLUMNS, normalize_candles
+
+# Tickers per download request, and requests in flight at once
+BATCH_SIZE = 10
+MAX_WORKERS = 4
+
+# Start dates this close together are fetched in one request from the earliest
+BUCKET_DAYS = 7
+
+
+def batches(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def split_download(raw, tickers):
+    # Multi-ticker downloads come back as (ticker, field) columns; one candle frame per ticker
+    frames = {}
+    for ticker in tickers:
+        if isinstance(raw.columns, pd.MultiIndex):
+            if ticker not in raw.columns.get_level_values(0):
+                continue
+            frame = raw[ticker]
+        else:
+            frame = raw
+        candles = normalize_candles(frame)
+        if not candles.empty:
+            frames[ticker] = candles
+    return frames
+
+
+def fetch_batch(tickers, start="2018-01-01", end=None, download=yf.download):
+    # yfinance's own thread pool is turned off: concurrency is bounded by our pool instead
+    raw = download(tickers, start=start, end=end, interval="1d", group_by="ticker",
+                   threads=False, progress=False)
+    return split_download(raw, tickers)
+
+
+def start_groups(starts, bucket_days=BUCKET_DAYS):
+    # Tickers whose start dates fall within `bucket_days` of each other share
+    # requests; a newly added ticker's full history is not pulled for the rest
+    order = sorted(starts, key=lambda ticker: (pd.Timestamp(starts[ticker]), ticker))
+    groups = []
+    for ticker in order:
+        start = pd.Timestamp(starts[ticker])
+        if groups and start - groups[-1][0] <= pd.Timedelta(days=bucket_days):
+            groups[-1][1].append(ticker)
+        else:
+            groups.append((start, [ticker]))
+    return [tickers for _, tickers in groups]
+
+
+def fetch_assets(tickers, start="2018-01-01", end=None, batch_size=BATCH_SIZE, max_workers=MAX_WORKERS,
+                 download=yf.download):
+    # `start` is a date or a {ticker: date} mapping; tickers are grouped by start
+    # date before batching, and each batch starts at its earliest ticker
+    starts = start if isinstance(start, dict) else {ticker: start for ticker in tickers}
+    starts = {ticker: starts[ticker] for ticker in tickers}
+    frames = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(fetch_batch, batch, min(starts[ticker] for ticker in batch), end, download)
+            for group in start_groups(starts)
+            for batch in batches(group, batch_size)
+        ]
+        for future in futures:
+            frames.update(future.result())
+    return frames
+
+
+def update_assets(tickers=DEFAULT_TICKERS, root=DATA_DIR, start="2018-01-01", overlap_days=3,
+                  batch_size=BATCH_SIZE, max_workers=MAX_WORKERS, download=yf.download):
+    # Same upsert as update_btc_data, per asset partition
+    stored = {}
+    starts = {}
+    have = set(stored_tickers("prices", root))
+    for ticker in tickers:
+        if ticker in have:
+            stored[ticker] = read_asset("prices", ticker, columns=BTC_COLUMNS, root=root)
+            last = stored[ticker]['date'].max()
+            starts[ticker] = (last - pd.Timedelta(days=overlap_days)).strftime("%Y-%m-%d")
+        else:
+            starts[ticker] = start
+
+    fresh = fetch_assets(tickers, starts, batch_size=batch_size, max_workers=max_workers, download=download)
+
+    fetched = {}
+    for ticker, candles in fresh.items():
+        if ticker in stored:
+            candles = pd.concat([stored[ticker], candles], ignore_index=True)
+        candles = candles.drop_duplicates(subset='date', keep='last')
+        write_asset(candles, "prices", ticker, root)
+        fetched[ticker] = len(fresh[ticker])
+    return fetched
+
+
+# Run if executed directly
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch daily candles for several assets, merge them with FGI and build features")
+    parser.add_argument("--tickers", nargs="+", default=DEFAULT_TICKERS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="tickers per download request")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="download requests in flight at once")
+    parser.add_argument("--skip-fetch", action="store_true", help="only re-merge and rebuild features")
+    args = parser.parse_args()
+
+    from scripts.feature_engineering import create_asset_features
+    from scripts.merge_data import merge_assets
+
+    if not args.skip_fetch:
+        fetched = update_assets(args.tickers, batch_size=args.batch_size, max_workers=args.workers)
+        for ticker in args.tickers:
+            print(f"✅ {ticker}: {fetched.get(ticker, 0)} rows fetched -> {asset_path('prices', ticker)}")
+
+    merged_rows = merge_assets(args.tickers)
+    featured_rows = create_asset_features(args.tickers)
+    for ticker in args.tickers:
+        print(f"✅ {ticker}: {merged_rows.get(ticker, 0)} merged, {featured_rows.get(ticker, 0)} featured rows")
+    print(f"✅ Asset tables saved under {table_dir('featured')}")
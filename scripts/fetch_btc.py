@@ -1,10 +1,24 @@
+import argparse
+
 import yfinance as yf
 import pandas as pd
 
+from data.store import DATA_DIR, read_table, table_exists, table_path, write_table
+
+BTC_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+
+def fetch_btc_data(start="2018-01-01", end=None, download=yf.download, ticker="BTC-USD"):
+    btc = download(ticker, start=start, end=end, interval="1d", progress=False)
 
-def fetch_btc_data(start="2018-01-01", end=None):
-    btc = yf.download("BTC-USD", start=start, end=end, interval="1d", progress=False)
+    # yfinance returns (field, ticker) MultiIndex columns; keep only the field names
+    # so the stored table gets flat column names
+    if isinstance(btc.columns, pd.MultiIndex):
+        btc.columns = btc.columns.get_level_values(0)
+    return normalize_candles(btc)
 
+
+def normalize_candles(btc):
     # Clean and format
     btc = btc.reset_index()
     btc = btc.rename(columns={
@@ -17,14 +31,54 @@ def fetch_btc_data(start="2018-01-01", end=None):
         "Volume": "volume"
     })
 
-    btc = btc[['date', 'open', 'high', 'low', 'close', 'volume']]
+    # Days before a ticker's listing come back empty in multi-ticker downloads
+    btc = btc[BTC_COLUMNS].dropna(subset=['close'])
     btc['date'] = pd.to_datetime(btc['date'])
+    if btc['date'].dt.tz is not None:
+        btc['date'] = btc['date'].dt.tz_localize(None)
     return btc
 
 
+def load_btc_data(root=DATA_DIR):
+    if not table_exists("btc_data", root):
+        return pd.DataFrame(columns=BTC_COLUMNS)
+    return read_table("btc_data", columns=BTC_COLUMNS, root=root)
+
+
+def update_btc_data(root=DATA_DIR, start="2018-01-01", overlap_days=3, download=yf.download):
+    stored = load_btc_data(root)
+
+    # Only fetch what is missing, re-reading a few days back to pick up revised candles
+    if stored.empty:
+        fetch_start = start
+    else:
+        fetch_start = (stored['date'].max() - pd.Timedelta(days=overlap_days)).strftime("%Y-%m-%d")
+
+    fresh = fetch_btc_data(start=fetch_start, download=download)
+
+    # Upsert: fetched candles replace stored rows for the same date
+    if stored.empty:
+        btc = fresh
+    else:
+        btc = pd.concat([stored, fresh], ignore_index=True)
+    btc = btc.drop_duplicates(subset='date', keep='last').sort_values('date').reset_index(drop=True)
+
+    write_table(btc, "btc_data", root)
+    return btc, len(fresh)
+
+
 # Run if executed directly
 if __name__ == "__main__":
-    btc_df = fetch_btc_data()
+    parser = argparse.ArgumentParser(description="Fetch daily BTC-USD candles")
+    parser.add_argument("--full", action="store_true", help="re-download the whole history instead of the missing days")
+    args = parser.parse_args()
+
+    if args.full:
+        btc_df = fetch_btc_data()
+        write_table(btc_df, "btc_data")
+        fetched = len(btc_df)
+    else:
+        btc_df, fetched = update_btc_data()
+
     print(btc_df.tail())
-    btc_df.to_csv("data/btc_data.csv", index=False)
-    print("✅ BTC price data saved to data/btc_data.csv")
+    print(f"✅ BTC price data saved to {table_path('btc_data')} ({fetched} rows fetched)")
@@ -1,17 +1,51 @@
+import argparse
+import os
+
 import requests
 import pandas as pd
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from data.store import DATA_DIR, load_json, read_table, save_json, table_exists, table_path, write_table
+
+FGI_URL = "https://api.alternative.me/fng/"
+FGI_CACHE_PATH = os.path.join(DATA_DIR, ".fgi_cache.json")
+FGI_COLUMNS = ['date', 'fgi_value', 'fgi_sentiment']
+REQUEST_TIMEOUT = 10
+
+_session = None
+
+
+def make_session(retries=3, backoff=0.5):
+    # Retries with exponential backoff on connection errors, throttling and 5xx responses
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=4)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
-def fetch_fgi_data(limit=1000):
-    url = f"https://api.alternative.me/fng/?limit={limit}&format=json"
 
-    response = requests.get(url)
-    data = response.json()
+def get_session():
+    # One pooled session per process, so repeated fetches reuse the connection
+    global _session
+    if _session is None:
+        _session = make_session()
+    return _session
 
-    fgi_list = data['data']
+
+def _to_frame(fgi_list):
+    if not fgi_list:
+        return pd.DataFrame(columns=FGI_COLUMNS)
 
     df = pd.DataFrame(fgi_list)
-    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
+    df['timestamp'] = pd.to_datetime(df['timestamp'].astype(int), unit='s')
     df['value'] = df['value'].astype(int)
     df = df.rename(columns={
         'value': 'fgi_value',
@@ -19,12 +53,87 @@ def fetch_fgi_data(limit=1000):
         'timestamp': 'date'
     })
 
-    df = df[['date', 'fgi_value', 'fgi_sentiment']].sort_values('date')
+    df = df[FGI_COLUMNS].sort_values('date').reset_index(drop=True)
     return df
 
+
+def fetch_fgi_data(limit=1000, base_url=FGI_URL, session=None, cache_path=None):
+    session = session or get_session()
+    params = {"limit": limit, "format": "json"}
+
+    # Conditional request: only valid if the cached response is for the same query
+    headers = {}
+    cache = load_json(cache_path) if cache_path is not None else None
+    if cache is not None and cache.get("params") == params:
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+    else:
+        cache = None
+
+    response = session.get(base_url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+
+    if response.status_code == 304 and cache is not None:
+        fgi_list = cache["data"]
+    else:
+        response.raise_for_status()
+        fgi_list = response.json()['data']
+        if cache_path is not None:
+            save_json(cache_path, {
+                "params": params,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "data": fgi_list,
+            })
+
+    return _to_frame(fgi_list)
+
+
+def load_fgi_data(root=DATA_DIR):
+    if not table_exists("fgi_data", root):
+        return pd.DataFrame(columns=FGI_COLUMNS)
+    return read_table("fgi_data", columns=FGI_COLUMNS, root=root)
+
+
+def missing_limit(stored, today=None, overlap=1, full_limit=1000):
+    # Number of records needed to cover the days since the newest stored one
+    if stored.empty:
+        return full_limit
+    today = today if today is not None else pd.Timestamp.now(tz="UTC").tz_localize(None).normalize()
+    gap = (today - stored['date'].max().normalize()).days
+    return max(gap, 0) + overlap
+
+
+def update_fgi_data(root=DATA_DIR, base_url=FGI_URL, session=None, cache_path=FGI_CACHE_PATH, today=None):
+    stored = load_fgi_data(root)
+    limit = missing_limit(stored, today=today)
+
+    fresh = fetch_fgi_data(limit=limit, base_url=base_url, session=session, cache_path=cache_path)
+
+    # Merge: fetched records replace stored rows for the same date
+    if stored.empty:
+        fgi = fresh
+    else:
+        fgi = pd.concat([stored, fresh], ignore_index=True)
+    fgi = fgi.drop_duplicates(subset='date', keep='last').sort_values('date').reset_index(drop=True)
+
+    write_table(fgi, "fgi_data", root)
+    return fgi, limit
+
+
 # Run if executed directly
 if __name__ == "__main__":
-    fgi_df = fetch_fgi_data()
-    print(fgi_df.head())
-    fgi_df.to_csv("data/fgi_data.csv", index=False)
-    print("✅ Fear & Greed Index data saved to data/fgi_data.csv")
+    parser = argparse.ArgumentParser(description="Fetch the Crypto Fear & Greed Index")
+    parser.add_argument("--full", action="store_true", help="re-download the last 1000 records instead of the missing days")
+    args = parser.parse_args()
+
+    if args.full:
+        fgi_df = fetch_fgi_data()
+        write_table(fgi_df, "fgi_data")
+        limit = len(fgi_df)
+    else:
+        fgi_df, limit = update_fgi_data()
+
+    print(fgi_df.tail())
+    print(f"✅ Fear & Greed Index data saved to {table_path('fgi_data')} (limit={limit})")
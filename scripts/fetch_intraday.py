@@ -0,0 +1,68 @@
+import argparse
+import glob
+import os
+
+import yfinance as yf
+import pandas as pd
+
+from data.intraday import ROLLUPS, build_rollup, raw_dir, write_raw_bars
+from data.store import DATA_DIR
+
+INTRADAY_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+
+def fetch_intraday_bars(interval="1h", start=None, end=None, period=None, download=yf.download):
+    # Yahoo only serves recent intraday history (about 7 days of 1m, 730 days of 1h)
+    if start is None and period is None:
+        period = "7d" if interval == "1m" else "60d"
+    bars = download("BTC-USD", start=start, end=end, period=period, interval=interval, progress=False)
+
+    if isinstance(bars.columns, pd.MultiIndex):
+        bars.columns = bars.columns.get_level_values(0)
+
+    bars = bars.reset_index()
+    bars = bars.rename(columns={
+        "Datetime": "date",
+        "Date": "date",
+        "Open": "open",
+        "High": "high",
+        "Low": "low",
+        "Close": "close",
+        "Volume": "volume"
+    })
+
+    bars = bars[INTRADAY_COLUMNS]
+    bars['date'] = pd.to_datetime(bars['date'], utc=True).dt.tz_localize(None)
+    return bars
+
+
+def last_stored_day(interval, root=DATA_DIR):
+    paths = sorted(glob.glob(os.path.join(raw_dir(interval, root), "*.parquet")))
+    if not paths:
+        return None
+    return pd.Timestamp(os.path.basename(paths[-1])[:-len(".parquet")])
+
+
+def update_intraday(interval="1h", rollups=ROLLUPS, root=DATA_DIR, download=yf.download):
+    # Re-fetch from the start of the newest stored day so its partition is completed
+    last_day = last_stored_day(interval, root)
+    start = None if last_day is None else last_day.strftime("%Y-%m-%d")
+
+    bars = fetch_intraday_bars(interval=interval, start=start, download=download)
+    partitions = write_raw_bars(bars, interval, root)
+
+    rows = {rule: build_rollup(rule, interval, root) for rule in rollups}
+    return len(bars), partitions, rows
+
+
+# Run if executed directly
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch intraday BTC-USD bars and rebuild the rollups")
+    parser.add_argument("--interval", default="1h", help="raw bar interval to ingest (e.g. 1m, 5m, 1h)")
+    parser.add_argument("--rollups", nargs="+", default=ROLLUPS, choices=ROLLUPS, help="resolutions to derive")
+    args = parser.parse_args()
+
+    fetched, partitions, rows = update_intraday(args.interval, args.rollups)
+    print(f"✅ {fetched} {args.interval} bars written to {partitions} day partitions in {raw_dir(args.interval)}")
+    for rule, count in rows.items():
+        print(f"✅ {rule} rollup: {count} bars")
@@ -0,0 +1,148 @@
+# scripts/indicators.py
+
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+@dataclass(frozen=True)
+class Indicator:
+    name: str
+    kind: str
+    # A raw column or an earlier indicator
+    source: str
+    window: int = 1
+
+
+# Every feature column derived from the merged data. Adding a row here is all
+# it takes to materialize a new column in the feature tables.
+INDICATORS = [
+    # Returns (percentage) over 1, 7 and 30 bars
+    Indicator("daily_return", "return", "close", 1),
+    Indicator("return_7d", "return", "close", 7),
+    Indicator("return_30d", "return", "close", 30),
+
+    # Rolling price statistics
+    Indicator("ma_7", "mean", "close", 7),
+    Indicator("ma_30", "mean", "close", 30),
+    Indicator("zscore_30", "zscore", "close", 30),
+    Indicator("rsi_14", "rsi", "close", 14),
+
+    # Rolling volatility (standard deviation of returns)
+    Indicator("volatility_7d", "std", "daily_return", 7),
+    Indicator("volatility_30d", "std", "daily_return", 30),
+
+    # Sentiment lags and changes
+    Indicator("fgi_value_lag1", "lag", "fgi_value", 1),
+    Indicator("fgi_sentiment_lag1", "lag", "fgi_sentiment", 1),
+    Indicator("fgi_delta_1", "delta", "fgi_value", 1),
+    Indicator("fgi_delta_7", "delta", "fgi_value", 7),
+]
+
+# Raw columns read as float32; anything else (sentiment labels) stays as objects
+FLOAT_SOURCES = ["close", "fgi_value"]
+
+
+def _window_sum(windows):
+    # Sums window columns left to right, so every row is added in the same order
+    # whatever the number of rows - keeps incremental and full runs bit-identical
+    total = windows[:, 0].copy()
+    for k in range(1, windows.shape[1]):
+        total += windows[:, k]
+    return total
+
+
+def _shift(values, n):
+    fill = np.nan if values.dtype.kind == "f" else None
+    out = np.full(len(values), fill, dtype=values.dtype)
+    if n < len(values):
+        out[n:] = values[:len(values) - n]
+    return out
+
+
+def _rolling_mean_std(values, window):
+    mean = np.full(len(values), np.nan, dtype=np.float32)
+    std = np.full(len(values), np.nan, dtype=np.float32)
+    if len(values) >= window:
+        windows = sliding_window_view(values, window)
+        mean[window - 1:] = _window_sum(windows) / window
+        dev = windows - mean[window - 1:, None]
+        std[window - 1:] = np.sqrt(_window_sum(dev * dev) / (window - 1))
+    return mean, std
+
+
+def _rolling_sum(values, window):
+    out = np.full(len(values), np.nan, dtype=np.float32)
+    if len(values) >= window:
+        out[window - 1:] = _window_sum(sliding_window_view(values, window))
+    return out
+
+
+def _rsi(values, window):
+    # Simple-average (Cutler) RSI: every value depends only on its own window,
+    # unlike Wilder's recursive smoothing, so it can be extended incrementally.
+    # clip keeps the unknown first change as NaN.
+    change = values - _shift(values, 1)
+    gains = _rolling_sum(np.clip(change, 0, None), window)
+    losses = _rolling_sum(np.clip(-change, 0, None), window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(losses == 0, np.float32(100), 100 - 100 / (1 + gains / losses)).astype(np.float32)
+
+
+def lookback(indicator, indicators=INDICATORS):
+    # Rows of history one value of `indicator` depends on, through its sources
+    by_name = {ind.name: ind for ind in indicators}
+    rows = indicator.window
+    if indicator.source in by_name:
+        rows += lookback(by_name[indicator.source], indicators)
+    return rows
+
+
+def max_lookback(indicators=INDICATORS):
+    return max(lookback(ind, indicators) for ind in indicators)
+
+
+def signature(indicators=INDICATORS):
+    # Changes whenever the registry does, so stored features know they are stale
+    return [[ind.name, ind.kind, ind.source, ind.window] for ind in indicators]
+
+
+def compute_indicators(columns, indicators=INDICATORS):
+    # One pass over the registry; rolling mean/std of a (source, window) pair
+    # is computed once and shared by the indicators that need it
+    columns = dict(columns)
+    rolling = {}
+
+    def mean_std(source, window):
+        if (source, window) not in rolling:
+            rolling[source, window] = _rolling_mean_std(columns[source], window)
+        return rolling[source, window]
+
+    out = {}
+    for ind in indicators:
+        values = columns[ind.source]
+        if ind.kind == "return":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                result = (values / _shift(values, ind.window) - 1) * 100
+        elif ind.kind == "mean":
+            result = mean_std(ind.source, ind.window)[0]
+        elif ind.kind == "std":
+            result = mean_std(ind.source, ind.window)[1]
+        elif ind.kind == "zscore":
+            mean, std = mean_std(ind.source, ind.window)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                result = (values - mean) / std
+        elif ind.kind == "rsi":
+            result = _rsi(values, ind.window)
+        elif ind.kind == "lag":
+            result = _shift(values, ind.window)
+        elif ind.kind == "delta":
+            result = values - _shift(values, ind.window)
+        else:
+            raise ValueError(f"Unknown indicator kind {ind.kind!r} for {ind.name}")
+
+        if result.dtype.kind == "f":
+            result = result.astype(np.float32, copy=False)
+        columns[ind.name] = out[ind.name] = result
+    return out
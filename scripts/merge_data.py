@@ -1,8 +1,14 @@
 import pandas as pd
 
-def merge_fgi_and_btc(fgi_path="data/fgi_data.csv", btc_path="data/btc_data.csv"):
-    fgi = pd.read_csv(fgi_path, parse_dates=["date"])
-    btc = pd.read_csv(btc_path, parse_dates=["date"])
+from data.assets import attach_fgi_by_asset, read_assets, stored_tickers, write_asset
+from data.store import DATA_DIR, read_table, table_path, write_table
+from instrumentation import instrument
+
+
+@instrument
+def merge_fgi_and_btc(root=DATA_DIR):
+    fgi = read_table("fgi_data", root=root)
+    btc = read_table("btc_data", root=root)
 
     # Align by date (inner join keeps only overlapping days)
     merged = pd.merge(btc, fgi, on="date", how="inner")
@@ -12,9 +18,24 @@ def merge_fgi_and_btc(fgi_path="data/fgi_data.csv", btc_path="data/btc_data.csv"
 
     return merged
 
+
+@instrument
+def merge_assets(tickers=None, root=DATA_DIR):
+    # Every asset joined to FGI in one as-of pass, then written back per asset
+    tickers = tickers or stored_tickers("prices", root)
+    prices = read_assets("prices", tickers=tickers, root=root)
+    fgi = read_table("fgi_data", columns=["date", "fgi_value", "fgi_sentiment"], root=root)
+    merged = attach_fgi_by_asset(prices, fgi)
+
+    rows = {}
+    for ticker, frame in merged.groupby("ticker", observed=True):
+        write_asset(frame, "merged", ticker, root)
+        rows[ticker] = len(frame)
+    return rows
+
 # Run if executed directly
 if __name__ == "__main__":
     df = merge_fgi_and_btc()
     print(df.head())
-    df.to_csv("data/merged_data.csv", index=False)
-    print("✅ Merged BTC + FGI data saved to data/merged_data.csv")
+    write_table(df, "merged_data")
+    print(f"✅ Merged BTC + FGI data saved to {table_path('merged_data')}")
@@ -0,0 +1,169 @@
+# scripts/pipeline.py
+
+import argparse
+import hashlib
+import importlib
+import inspect
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from data.store import DATA_DIR, load_json, save_json, table_path, write_table
+
+STATE_FILE = ".pipeline_state.json"
+
+
+@dataclass
+class Stage:
+    name: str
+    run: callable
+    deps: list = field(default_factory=list)
+    inputs: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+    # Stages reading from the network have nothing to hash up front and always run
+    cacheable: bool = True
+
+
+def _fetch_btc(root):
+    from scripts.fetch_btc import update_btc_data
+    update_btc_data(root=root)
+
+
+def _fetch_fgi(root):
+    from scripts.fetch_fgi import update_fgi_data
+    update_fgi_data(root=root)
+
+
+def _merge(root):
+    from scripts.merge_data import merge_fgi_and_btc
+    write_table(merge_fgi_and_btc(root=root), "merged_data", root)
+
+
+def _features(root):
+    from scripts.feature_engineering import update_features
+    update_features(root=root)
+
+
+# Code hashed for each stage: the modules that implement it. Features also
+# depend on the indicator registry, which decides which columns exist
+STAGE_MODULES = {
+    "fetch_btc": ["scripts.fetch_btc"],
+    "fetch_fgi": ["scripts.fetch_fgi"],
+    "merge": ["scripts.merge_data"],
+    "features": ["scripts.feature_engineering", "scripts.indicators"],
+}
+
+STAGES = [
+    Stage("fetch_btc", _fetch_btc, outputs=["btc_data"], cacheable=False),
+    Stage("fetch_fgi", _fetch_fgi, outputs=["fgi_data"], cacheable=False),
+    Stage("merge", _merge, deps=["fetch_btc", "fetch_fgi"], inputs=["btc_data", "fgi_data"], outputs=["merged_data"]),
+    Stage("features", _features, deps=["merge"], inputs=["merged_data"], outputs=["featured_data"]),
+]
+
+
+def _file_digest(path, digest):
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+
+
+def stage_hash(stage, root=DATA_DIR):
+    # Hash of the input tables plus the source of the modules implementing the stage
+    digest = hashlib.sha256()
+    for name in stage.inputs:
+        path = table_path(name, root)
+        if not os.path.exists(path):
+            return None
+        digest.update(name.encode())
+        _file_digest(path, digest)
+
+    for module_name in STAGE_MODULES[stage.name]:
+        digest.update(module_name.encode())
+        _file_digest(inspect.getsourcefile(importlib.import_module(module_name)), digest)
+    return digest.hexdigest()
+
+
+def _run_stage(stage, root, state, force):
+    start = time.perf_counter()
+
+    key = stage_hash(stage, root) if stage.cacheable else None
+    outputs_exist = all(os.path.exists(table_path(name, root)) for name in stage.outputs)
+    if not force and key is not None and outputs_exist and state.get(stage.name) == key:
+        return "skipped", time.perf_counter() - start, key
+
+    stage.run(root)
+    if stage.cacheable and key is None:
+        # Inputs only became available while running (e.g. migrated from CSV)
+        key = stage_hash(stage, root)
+    return "ran", time.perf_counter() - start, key
+
+
+def run_pipeline(stages=STAGES, root=DATA_DIR, force=False, skip=(), max_workers=4):
+    state = load_json(os.path.join(root, STATE_FILE), {})
+    by_name = {stage.name: stage for stage in stages}
+    pending = {stage.name for stage in stages}
+    results = {}
+
+    for name in skip:
+        results[name] = ("skipped", 0.0, None)
+        pending.discard(name)
+
+    # Launch each stage as soon as its dependencies are done, so independent
+    # stages (the two fetches) overlap
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running = {}
+        while pending or running:
+            for name in sorted(pending):
+                deps = by_name[name].deps
+                if any(results.get(dep, ("",))[0] in ("failed", "blocked") for dep in deps):
+                    results[name] = ("blocked", 0.0, None)
+                    pending.discard(name)
+                elif all(dep in results for dep in deps):
+                    running[pool.submit(_run_stage, by_name[name], root, state, force)] = name
+                    pending.discard(name)
+
+            if not running:
+                # Whatever is left depends on a stage that is not in the graph
+                for name in pending:
+                    results[name] = ("blocked", 0.0, None)
+                pending.clear()
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    status, elapsed, key = future.result()
+                except Exception as exc:
+                    results[name] = ("failed", 0.0, None)
+                    print(f"❌ {name} failed: {exc}")
+                    continue
+                results[name] = (status, elapsed, key)
+                if key is not None:
+                    state[name] = key
+
+    save_json(os.path.join(root, STATE_FILE), state, indent=2)
+    return {name: results[name][:2] for name in by_name}
+
+
+def print_report(results):
+    print(f"{'stage':<12} {'status':<8} {'seconds':>8}")
+    for name, (status, elapsed) in results.items():
+        print(f"{name:<12} {status:<8} {elapsed:>8.3f}")
+
+
+# Run if executed directly
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the fetch -> merge -> features pipeline")
+    parser.add_argument("--force", action="store_true", help="rerun every stage even if its inputs are unchanged")
+    parser.add_argument("--skip-fetch", action="store_true", help="reuse the stored BTC and FGI tables")
+    args = parser.parse_args()
+
+    skip = ["fetch_btc", "fetch_fgi"] if args.skip_fetch else []
+    results = run_pipeline(force=args.force, skip=skip)
+    print_report(results)
+
+    if any(status in ("failed", "blocked") for status, _ in results.values()):
+        sys.exit(1)
@@ -0,0 +1,37 @@
+# tests/test_batch_score.py
+
+import os
+
+import numpy as np
+
+from models.batch_score import latest_artifact, load_scoring_model, score_range
+from models.model import run_logistic_model
+from models.online import rebuild, save_checkpoint, update_online_model
+from models.prediction import model_version
+from tests.test_online import make_frame
+
+
+def test_batch_score_after_an_online_update(tmp_path):
+    df = make_frame(400)
+    df["close"] = 100 * np.exp(np.cumsum(np.random.default_rng(1).normal(0, 0.02, len(df))))
+    artifact_dir = str(tmp_path)
+
+    model, scaler, accuracy, key = load_scoring_model(df, artifact_dir=artifact_dir)
+    batch_path = os.path.join(artifact_dir, f"{key}.joblib")
+    assert os.path.exists(batch_path)
+
+    # The online checkpoint is written after the batch artifact, both where it
+    # lives now and where older versions put it, next to the batch models
+    update_online_model(df, path=os.path.join(artifact_dir, "online", "online_sgd.joblib"))
+    legacy = os.path.join(artifact_dir, "online_sgd.joblib")
+    save_checkpoint(rebuild(df.iloc[:300]), legacy)
+    os.utime(legacy, (os.path.getmtime(batch_path) + 10,) * 2)
+
+    assert latest_artifact(artifact_dir) == batch_path
+    model, scaler, accuracy, loaded_key = load_scoring_model(df, artifact_dir=artifact_dir)
+    assert loaded_key == key
+
+    scored = score_range(df, model, scaler, accuracy, model_version(run_logistic_model), key)
+    assert len(scored) == len(df)
+    assert scored["is_correct"].isna().sum() == 1
+    assert (scored["training_key"] == key).all()
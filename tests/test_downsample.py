@@ -0,0 +1,28 @@
+# tests/test_downsample.py
+
+import numpy as np
+
+from visuals.downsample import lttb
+
+
+def test_lttb_keeps_extremes_sharing_a_bucket():
+    x = np.arange(200)
+    y = np.sin(x / 20)
+    y[50], y[51] = 10, -10
+
+    idx = lttb(x, y, 50)
+
+    assert 50 in idx and 51 in idx
+    assert np.all(np.diff(idx) > 0)
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+
+
+def test_lttb_keeps_extremes_in_separate_buckets():
+    x = np.arange(200)
+    y = np.zeros(200)
+    y[20], y[150] = 5, -5
+
+    idx = lttb(x, y, 30)
+
+    assert 20 in idx and 150 in idx
+    assert len(idx) == 30
@@ -0,0 +1,27 @@
+# tests/test_feature_engineering.py
+
+import pandas as pd
+
+from benchmarks.synthetic import make_btc, make_fgi
+from data.store import read_table, write_table
+from scripts.feature_engineering import create_features, update_features
+
+
+def make_merged(n_rows=500):
+    merged = pd.merge(make_btc(n_rows), make_fgi(n_rows), on="date")
+    merged["date"] = pd.date_range("2022-01-01", periods=n_rows, freq="D")
+    return merged
+
+
+def test_update_extends_a_truncated_table(tmp_path):
+    root = str(tmp_path)
+    merged = make_merged()
+    write_table(merged.iloc[:400], "merged_data", root)
+    _, added = update_features(root)
+    assert added == len(create_features(root))
+
+    write_table(merged, "merged_data", root)
+    features, added = update_features(root, verify=True)
+    assert added == 100
+    assert len(read_table("featured_data", root=root)) == len(features)
+    assert features["date"].is_monotonic_increasing
@@ -0,0 +1,54 @@
+# tests/test_online.py
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from models.model import FEATURES
+from models.online import rebuild
+
+
+def make_frame(n_rows=1500, seed=0):
+    # Features on their real scales, with a target that depends on them
+    rng = np.random.default_rng(seed)
+    fgi = rng.integers(5, 95, n_rows).astype(float)
+    df = pd.DataFrame({
+        "date": pd.date_range("2020-01-01", periods=n_rows, freq="D"),
+        "fgi_value": fgi,
+        "fgi_value_lag1": np.roll(fgi, 1),
+        "volatility": rng.gamma(2.0, 1.5, n_rows),
+        "sentiment_encoded": rng.integers(0, 3, n_rows).astype(float),
+    })
+    X = StandardScaler().fit_transform(df[FEATURES])
+    logit = X @ np.array([1.0, -0.5, 0.3, -0.8])
+    df["target"] = (rng.random(n_rows) < 1 / (1 + np.exp(-logit))).astype(int)
+    return df
+
+
+def test_online_model_tracks_the_logistic_baseline():
+    df = make_frame()
+    online = rebuild(df)
+
+    rows = df.iloc[:-1]
+    scaler = StandardScaler().fit(rows[FEATURES])
+    batch = LogisticRegression().fit(scaler.transform(rows[FEATURES]), rows["target"])
+    X = rows[FEATURES].to_numpy(dtype=float)
+
+    agreement = (online.predict(X) == batch.predict(scaler.transform(rows[FEATURES]))).mean()
+    batch_hit_rate = batch.score(scaler.transform(rows[FEATURES]), rows["target"])
+
+    assert agreement >= 0.9
+    # Each row predicted before it is learned, so a little below the in-sample fit
+    assert online.accuracy >= batch_hit_rate - 0.05
+    assert np.array_equal(np.sign(online.model.coef_[0]), np.sign(batch.coef_[0]))
+    assert np.abs(online.model.coef_[0]).max() < 3 * np.abs(batch.coef_[0]).max()
+
+
+def test_daily_updates_match_a_rebuild():
+    df = make_frame(400)
+    online = rebuild(df.iloc[:300])
+    for n in range(301, len(df) + 1):
+        online.update(df.iloc[:n])
+
+    assert np.array_equal(online.model.coef_, rebuild(df).model.coef_)
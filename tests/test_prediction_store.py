@@ -0,0 +1,57 @@
+# tests/test_prediction_store.py
+
+import sqlite3
+
+from models.prediction_store import BACKFILL, LIVE, PredictionStore
+
+VERSION = "run_logistic_model-test"
+
+
+def scanned_accuracy(store, model_version=None):
+    # What the trigger-maintained totals must match: live rows with a known outcome
+    rows = store.range(model_version=model_version, source=LIVE).dropna(subset=["is_correct"])
+    return rows["is_correct"].mean() if len(rows) else None
+
+
+def check(store):
+    assert store.accuracy() == scanned_accuracy(store)
+    assert store.accuracy(VERSION) == scanned_accuracy(store, VERSION)
+
+
+def row(date, is_correct, source=LIVE):
+    return {"date": date, "model_version": VERSION, "predicted_direction": 1,
+            "probability": 0.6, "is_correct": is_correct, "accuracy": 0.55, "source": source}
+
+
+def test_accuracy_totals_follow_every_write(tmp_path):
+    store = PredictionStore(str(tmp_path / "predictions.db"))
+
+    store.upsert([row("2024-01-01", 1), row("2024-01-02", 0), row("2024-01-03", None)])
+    check(store)
+    assert store.accuracy() == 0.5
+
+    # Outcome known, then revised
+    store.upsert([row("2024-01-03", 1)])
+    store.upsert([row("2024-01-02", 1)])
+    check(store)
+    assert store.accuracy() == 1.0
+
+    # A backfill adds its own dates but leaves live rows and the totals alone
+    store.upsert([row("2024-01-01", 0, BACKFILL), row("2024-01-04", 0, BACKFILL)])
+    check(store)
+    assert store.get("2024-01-01", VERSION)["source"] == LIVE
+    assert store.get("2024-01-01", VERSION)["is_correct"] == 1
+    assert store.get("2024-01-04", VERSION)["source"] == BACKFILL
+    assert store.accuracy() == 1.0
+
+    # A live prediction replaces a backfilled one
+    store.upsert([row("2024-01-04", 0)])
+    check(store)
+    assert store.accuracy() == 0.75
+
+    conn = sqlite3.connect(store.path)
+    with conn:
+        conn.execute("DELETE FROM predictions WHERE date = '2024-01-04'")
+    conn.close()
+    check(store)
+    assert store.accuracy() == 1.0
@@ -0,0 +1,68 @@
+# visuals/correlation.py
+
+import numpy as np
+import pandas as pd
+
+from data.load_data import date_bounds
+
+
+# Cumulative sums of x, x² and xy for every numeric column pair. Any date
+# range's correlation matrix is a difference of two prefix rows, so its cost
+# depends on the number of columns, not the number of rows. Rows with a
+# missing value in any column are left out.
+class PrefixCorrelation:
+    def __init__(self, df, columns=None):
+        data = df[columns] if columns is not None else df.select_dtypes(include='number')
+        self.columns = list(data.columns)
+        self.dates = pd.DatetimeIndex(df['date'])
+
+        X = data.to_numpy(dtype=float)
+        valid = np.isfinite(X).all(axis=1)
+
+        # Centre on the column means first: keeps the running sums small, which
+        # avoids cancellation when subtracting two large prefix values
+        X = np.where(valid[:, None], X - np.nanmean(X[valid], axis=0), 0.0)
+
+        # xy is symmetric, so only the upper triangle (i <= j) is kept:
+        # k(k+1)/2 columns instead of k²
+        k = len(self.columns)
+        self._rows, self._cols = np.triu_indices(k)
+        self._pair = np.zeros((k, k), dtype=int)
+        self._pair[self._rows, self._cols] = self._pair[self._cols, self._rows] = np.arange(len(self._rows))
+
+        self._n = np.concatenate([[0], np.cumsum(valid)])
+        self._sum = np.concatenate([np.zeros((1, k)), np.cumsum(X, axis=0)])
+        self._cross = np.concatenate([np.zeros((1, len(self._rows))),
+                                      np.cumsum(X[:, self._rows] * X[:, self._cols], axis=0)])
+
+    def matrix(self, start=None, end=None):
+        lo, hi = date_bounds(self.dates, start, end)
+        n = self._n[hi] - self._n[lo]
+        if n < 2:
+            return pd.DataFrame(np.nan, index=self.columns, columns=self.columns)
+
+        sx = self._sum[hi] - self._sum[lo]
+        cov = (self._cross[hi] - self._cross[lo])[self._pair] - np.outer(sx, sx) / n
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.outer(std, std)
+        return pd.DataFrame(np.clip(corr, -1, 1), index=self.columns, columns=self.columns)
+
+    def rolling(self, a, b, window, start=None, end=None):
+        # Correlation of two columns over the trailing `window` rows, dated at the
+        # window's last row; only the windows ending inside the range are computed
+        i, j = self.columns.index(a), self.columns.index(b)
+        ij, ii, jj = self._pair[i, j], self._pair[i, i], self._pair[j, j]
+        lo, hi = date_bounds(self.dates, start, end)
+        ends = np.arange(max(lo, window - 1), hi) + 1
+
+        n = self._n[ends] - self._n[ends - window]
+        sa = self._sum[ends, i] - self._sum[ends - window, i]
+        sb = self._sum[ends, j] - self._sum[ends - window, j]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = (self._cross[ends, ij] - self._cross[ends - window, ij]) - sa * sb / n
+            var_a = (self._cross[ends, ii] - self._cross[ends - window, ii]) - sa * sa / n
+            var_b = (self._cross[ends, jj] - self._cross[ends - window, jj]) - sb * sb / n
+            corr = np.where(n >= 2, cov / np.sqrt(var_a * var_b), np.nan)
+
+        return pd.Series(np.clip(corr, -1, 1), index=self.dates[ends - 1], name=f"{a} vs {b}")
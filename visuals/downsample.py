@@ -0,0 +1,81 @@
+# visuals/downsample.py
+
+import numpy as np
+
+# Roughly the plot area of a wide-layout chart; one point per pixel is all a line can show
+DEFAULT_WIDTH_PX = 1200
+
+
+def target_points(n_rows, width_px=DEFAULT_WIDTH_PX):
+    # Short date ranges keep every row; long ones are cut down to the chart width
+    return min(n_rows, int(width_px))
+
+
+def lttb(x, y, n_out):
+    # Largest-Triangle-Three-Buckets: keeps the first and last point, then from
+    # each bucket the point forming the largest triangle with the previously kept
+    # point and the average of the next bucket
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo = edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+
+    # The overall high and low always make it in, in place of their bucket's pick.
+    # When both fall in one bucket, both are kept (one point over `n_out`)
+    extremes = {int(np.argmax(y)), int(np.argmin(y))} - {0, n - 1}
+    if extremes:
+        replaced = np.searchsorted(edges, sorted(extremes), side="right")
+        idx = np.sort(np.concatenate([np.delete(idx, replaced), sorted(extremes)]))
+
+    return idx
+
+
+def minmax(y, n_out):
+    # Min and max of each bucket, so every peak and trough survives
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    keep = [0, n - 1]
+    for bucket in np.array_split(np.arange(n), (n_out - 2) // 2):
+        keep.append(bucket[np.argmin(y[bucket])])
+        keep.append(bucket[np.argmax(y[bucket])])
+    return np.unique(keep)
+
+
+def downsample(df, x_col, y_col, max_points, method="lttb"):
+    # Rows of `df` to plot for one trace; missing values (e.g. moving-average
+    # warm-up) are dropped first since they have no position on the chart
+    if max_points is None:
+        return df
+    df = df.dropna(subset=[y_col])
+    if len(df) <= max_points:
+        return df
+
+    x = df[x_col].to_numpy()
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype("datetime64[ns]").astype("int64")
+
+    if method == "minmax":
+        idx = minmax(df[y_col].to_numpy(), max_points)
+    else:
+        idx = lttb(x, df[y_col].to_numpy(), max_points)
+    return df.iloc[idx]
@@ -1,31 +1,158 @@
+import numpy as np
 import pandas as pd
 
+from data.load_data import date_bounds
+from instrumentation import instrument
 
-def generate_sentiment_summary(df):
-    summary = df.groupby('fgi_sentiment_lag1').agg(
-        avg_return=('daily_return', 'mean'),
-        volatility=('daily_return', 'std'),
-        win_rate=('daily_return', lambda x: (x > 0).mean())
-    ).reset_index()
+
+# Per-key running totals (count, sum, sum of squares, positive days) of one
+# value column, in date order. Any date range's per-key stats are the
+# difference of two prefix rows - no groupby, no Python callbacks.
+class CumulativeIndex:
+    def __init__(self, dates, keys, values):
+        self.dates = pd.DatetimeIndex(dates)
+        keys = pd.Series(keys)
+        if isinstance(keys.dtype, pd.CategoricalDtype):
+            # Categorical keys keep their category order (e.g. Extreme Fear first)
+            codes, labels = keys.cat.codes.to_numpy(), keys.cat.categories
+        else:
+            codes, labels = pd.factorize(keys.astype(object), sort=True)
+        self.labels = list(labels)
+
+        values = np.asarray(values, dtype=float)
+        valid = (codes >= 0) & np.isfinite(values)
+        # Shift by the mean so the sums of squares stay small; variance is unaffected
+        offset = values[valid].mean() if valid.any() else 0.0
+        centred = np.where(valid, values - offset, 0.0)
+        self._offset = offset
+
+        onehot = np.zeros((len(values), len(self.labels)))
+        onehot[np.flatnonzero(valid), codes[valid]] = 1.0
+
+        zero = np.zeros((1, len(self.labels)))
+        self._count = np.concatenate([zero, np.cumsum(onehot, axis=0)])
+        self._sum = np.concatenate([zero, np.cumsum(onehot * centred[:, None], axis=0)])
+        self._sumsq = np.concatenate([zero, np.cumsum(onehot * (centred ** 2)[:, None], axis=0)])
+        self._positive = np.concatenate([zero, np.cumsum(onehot * (np.where(valid, values, 0.0) > 0)[:, None], axis=0)])
+
+    def bounds(self, start, end):
+        return date_bounds(self.dates, start, end)
+
+    def aggregate(self, start, end):
+        return self.aggregate_rows(*self.bounds(start, end))
+
+    def aggregate_rows(self, lo, hi):
+        count = self._count[hi] - self._count[lo]
+        total = self._sum[hi] - self._sum[lo]
+        sumsq = self._sumsq[hi] - self._sumsq[lo]
+        positive = self._positive[hi] - self._positive[lo]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = total / count
+            std = np.sqrt(np.maximum(sumsq - total * mean, 0.0) / (count - 1))
+            std = np.where(count > 1, std, np.nan)
+            win_rate = positive / count
+
+        stats = pd.DataFrame({
+            "key": self.labels,
+            "count": count.astype(int),
+            "mean": mean + self._offset,
+            "std": std,
+            "win_rate": win_rate,
+        })
+        return stats[stats["count"] > 0].reset_index(drop=True)
+
+
+def _streak_bucket(dates, sentiment):
+    # Days the current run of identical sentiment has lasted, bucketed. Counted
+    # in calendar days, so intraday bars of one day share that day's streak
+    sentiment = pd.Series(sentiment).astype(object).reset_index(drop=True)
+    day = pd.Series(pd.DatetimeIndex(dates).normalize())
+    run_id = (sentiment != sentiment.shift()).cumsum()
+    new_day = (day != day.shift()) | (run_id != run_id.shift())
+    length = new_day.astype(int).groupby(run_id).cumsum()
+    return pd.cut(length, [0, 1, 3, 7, np.inf], labels=["1 day", "2-3 days", "4-7 days", "8+ days"]).astype(object)
+
+
+def _previous_day(dates, values):
+    # Each row gets the value of the previous day (the previous row on daily data)
+    day = pd.Series(pd.DatetimeIndex(dates).normalize())
+    by_day = values.groupby(day.to_numpy()).first()
+    return day.map(by_day.shift(1))
+
+
+# Daily returns broken down by yesterday's sentiment, by the sentiment
+# transition into yesterday, and by how long that sentiment had lasted
+class SentimentIndex:
+    @instrument(name="visuals.insights.SentimentIndex")
+    def __init__(self, df):
+        sentiment = df['fgi_sentiment_lag1'].reset_index(drop=True)
+        labels = sentiment.astype(object)
+        transition = _previous_day(df['date'], labels) + " → " + labels
+
+        self.breakdowns = {
+            "sentiment": CumulativeIndex(df['date'], sentiment, df['daily_return']),
+            "transition": CumulativeIndex(df['date'], transition, df['daily_return']),
+            "streak": CumulativeIndex(df['date'], _streak_bucket(df['date'], sentiment), df['daily_return']),
+        }
+
+    def aggregate(self, start, end, by="sentiment"):
+        return self.breakdowns[by].aggregate(start, end)
+
+
+def _range_stats(df, index, by="sentiment"):
+    if df.empty:
+        return index.breakdowns[by].aggregate_rows(0, 0)
+    return index.aggregate(df['date'].iloc[0], df['date'].iloc[-1], by)
+
+
+@instrument
+def generate_sentiment_summary(df, index=None):
+    # With a SentimentIndex covering `df`'s dates, stats come from the index;
+    # `df` must then be a contiguous date slice of the indexed data
+    if index is not None:
+        stats = _range_stats(df, index)
+        summary = pd.DataFrame({
+            'fgi_sentiment_lag1': stats['key'],
+            'avg_return': stats['mean'],
+            'volatility': stats['std'],
+            'win_rate': stats['win_rate'],
+        })
+    else:
+        summary = df.groupby('fgi_sentiment_lag1', observed=True).agg(
+            avg_return=('daily_return', 'mean'),
+            volatility=('daily_return', 'std'),
+            win_rate=('daily_return', lambda x: (x > 0).mean())
+        ).reset_index()
 
     summary.columns = ['Sentiment (Yesterday)', 'Avg Return (%)', 'Volatility', 'Win Rate']
-    summary['Avg Return (%)'] = (summary['Avg Return (%)'] * 100).round(2)
-    summary['Volatility'] = (summary['Volatility'] * 100).round(2)
-    summary['Win Rate'] = (summary['Win Rate'] * 100).round(1).astype(str) + '%'
+    # float64 before rounding: float32 stats would print as 20.799999
+    summary['Avg Return (%)'] = (summary['Avg Return (%)'].astype(float) * 100).round(2)
+    summary['Volatility'] = (summary['Volatility'].astype(float) * 100).round(2)
+    summary['Win Rate'] = (summary['Win Rate'].astype(float) * 100).round(1).astype(str) + '%'
 
     return summary
 
 
-def generate_observations(df):
+@instrument
+def generate_observations(df, index=None):
     obs = []
 
-    fear_df = df[df['fgi_sentiment_lag1'] == 'Extreme Fear']
-    greed_df = df[df['fgi_sentiment_lag1'] == 'Extreme Greed']
-
-    if not fear_df.empty and not greed_df.empty:
-        avg_fear_ret = fear_df['daily_return'].mean() * 100
-        avg_greed_ret = greed_df['daily_return'].mean() * 100
+    if index is not None:
+        stats = _range_stats(df, index).set_index('key')
+        have_both = 'Extreme Fear' in stats.index and 'Extreme Greed' in stats.index
+        if have_both:
+            avg_fear_ret = stats.loc['Extreme Fear', 'mean'] * 100
+            avg_greed_ret = stats.loc['Extreme Greed', 'mean'] * 100
+    else:
+        fear_df = df[df['fgi_sentiment_lag1'] == 'Extreme Fear']
+        greed_df = df[df['fgi_sentiment_lag1'] == 'Extreme Greed']
+        have_both = not fear_df.empty and not greed_df.empty
+        if have_both:
+            avg_fear_ret = fear_df['daily_return'].mean() * 100
+            avg_greed_ret = greed_df['daily_return'].mean() * 100
 
+    if have_both:
         obs.append(f"📉 **Extreme Fear** days saw an average return of **{avg_fear_ret:.2f}%**.")
         obs.append(f"📈 **Extreme Greed** days saw an average return of **{avg_greed_ret:.2f}%**.")
 
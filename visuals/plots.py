@@ -1,23 +1,33 @@
-import plotly.express as px
-import seaborn as sns
-import matplotlib.pyplot as plt
 import pandas as pd
-import plotly.graph_objs as go
+
+from visuals.downsample import downsample
+from instrumentation import instrument
+
+# Plotting libraries are imported inside each builder, so importing this module
+# (and starting the dashboard) doesn't load plotly, matplotlib or seaborn
 
 # Line plot: BTC price + FGI over time
 
-def plot_price_vs_sentiment(df):
+# `max_points` opts a time-series chart into downsampling (see visuals/downsample.py)
+
+@instrument
+def plot_price_vs_sentiment(df, max_points=None, method="lttb"):
+    import plotly.graph_objs as go
+
     fig = go.Figure()
 
+    price = downsample(df, 'date', 'close', max_points, method)
+    fgi = downsample(df, 'date', 'fgi_value', max_points, method)
+
     fig.add_trace(go.Scatter(
-        x=df['date'], y=df['close'],
+        x=price['date'], y=price['close'],
         name="BTC Closing Price",
         yaxis="y1",
         line=dict(color="royalblue")
     ))
 
     fig.add_trace(go.Scatter(
-        x=df['date'], y=df['fgi_value'],
+        x=fgi['date'], y=fgi['fgi_value'],
         name="Fear & Greed Index",
         yaxis="y2",
         line=dict(color="orange")
@@ -35,7 +45,10 @@ def plot_price_vs_sentiment(df):
 
 
 
+@instrument
 def plot_return_boxplot(df):
+    import plotly.express as px
+
     fig = px.box(
         df,
         x="fgi_sentiment",
@@ -48,24 +61,40 @@ def plot_return_boxplot(df):
     return fig
 
 
-# Correlation heatmap (matplotlib + seaborn)
-def plot_corr_heatmap(df):
+# Correlation heatmap (matplotlib + seaborn); pass `corr` to reuse a precomputed matrix
+@instrument
+def plot_corr_heatmap(df, corr=None):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     fig, ax = plt.subplots(figsize=(10, 6))
-    corr = df.select_dtypes(include='number').corr()
+    if corr is None:
+        corr = df.select_dtypes(include='number').corr()
     sns.heatmap(corr, annot=True, cmap="coolwarm", fmt=".2f", ax=ax)
     ax.set_title("Feature Correlation Heatmap", fontsize=14)
     return fig
 
 
-def plot_price_with_moving_averages(df):
-    df = df.copy()
-    df['MA_7'] = df['close'].rolling(window=7).mean()
-    df['MA_30'] = df['close'].rolling(window=30).mean()
+@instrument
+def plot_price_with_moving_averages(df, max_points=None, method="lttb"):
+    import plotly.graph_objs as go
+
+    # ma_7/ma_30 are materialized by feature engineering over the whole history;
+    # frames without them get the averages computed here
+    if 'ma_7' not in df.columns or 'ma_30' not in df.columns:
+        df = df.copy()
+        df['ma_7'] = df['close'].rolling(window=7).mean()
+        df['ma_30'] = df['close'].rolling(window=30).mean()
+
+    # Averages are taken over every row before any trace is thinned out
+    close = downsample(df, 'date', 'close', max_points, method)
+    ma_7 = downsample(df, 'date', 'ma_7', max_points, method)
+    ma_30 = downsample(df, 'date', 'ma_30', max_points, method)
 
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=df['date'], y=df['close'], mode='lines', name='BTC Close Price', line=dict(color='white')))
-    fig.add_trace(go.Scatter(x=df['date'], y=df['MA_7'], mode='lines', name='7-Day MA', line=dict(color='blue')))
-    fig.add_trace(go.Scatter(x=df['date'], y=df['MA_30'], mode='lines', name='30-Day MA', line=dict(color='orange')))
+    fig.add_trace(go.Scatter(x=close['date'], y=close['close'], mode='lines', name='BTC Close Price', line=dict(color='white')))
+    fig.add_trace(go.Scatter(x=ma_7['date'], y=ma_7['ma_7'], mode='lines', name='7-Day MA', line=dict(color='blue')))
+    fig.add_trace(go.Scatter(x=ma_30['date'], y=ma_30['ma_30'], mode='lines', name='30-Day MA', line=dict(color='orange')))
 
     fig.update_layout(
         title="Bitcoin Price with Moving Averages",
@@ -76,7 +105,10 @@ def plot_price_with_moving_averages(df):
     )
     return fig
 
+@instrument
 def plot_return_histogram(df):
+    import plotly.graph_objs as go
+
     fig = go.Figure()
     fig.add_trace(go.Histogram(x=df['daily_return'], nbinsx=50, name='Daily Returns'))
     fig.update_layout(
@@ -87,7 +119,9 @@ def plot_return_histogram(df):
     return fig
 
 
+@instrument
 def plot_feature_importance(coefs):
+    import plotly.express as px
     import pandas as pd
 
     # Convert to DataFrame if not already
@@ -98,7 +132,11 @@ def plot_feature_importance(coefs):
     fig.update_layout(xaxis_title="Feature", yaxis_title="Coefficient")
     return fig
 
-def plot_volatility_trendline(df):
+@instrument
+def plot_volatility_trendline(df, max_points=None, method="lttb"):
+    import plotly.express as px
+
+    df = downsample(df, 'date', 'volatility_7d', max_points, method)
     fig = px.line(df, x="date", y="volatility_7d", title="7-Day Rolling Volatility")
     fig.update_traces(mode="lines+markers")
     return fig